@@ -19,6 +19,7 @@ from typing import Dict, List, Optional, Tuple
 from config import Config
 from evcc_client import EvccClient
 from logging_util import log
+from state import parse_evcc_timestamp
 
 
 # =============================================================================
@@ -459,12 +460,7 @@ class ChargeSequencer:
             try:
                 s = t.get("start", "")
                 val = float(t.get("value", 0))
-                if s.endswith("Z"):
-                    start = datetime.fromisoformat(s.replace("Z", "+00:00"))
-                elif "+" in s:
-                    start = datetime.fromisoformat(s)
-                else:
-                    start = datetime.fromisoformat(s).replace(tzinfo=timezone.utc)
+                start = parse_evcc_timestamp(s)
                 hour = start.replace(minute=0, second=0, microsecond=0)
                 if hour >= now.replace(minute=0, second=0, microsecond=0):
                     buckets[hour].append(val)
@@ -486,12 +482,7 @@ class ChargeSequencer:
                 val = float(t.get("value", 0)) * unit_factor
                 if val <= 0:
                     continue
-                if s.endswith("Z"):
-                    start = datetime.fromisoformat(s.replace("Z", "+00:00"))
-                elif "+" in s:
-                    start = datetime.fromisoformat(s)
-                else:
-                    start = datetime.fromisoformat(s).replace(tzinfo=timezone.utc)
+                start = parse_evcc_timestamp(s)
                 if start >= now:
                     result.append((start, val))
             except Exception:
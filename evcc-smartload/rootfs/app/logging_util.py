@@ -12,5 +12,5 @@ logging.basicConfig(
 _logger = logging.getLogger("smartload")
 
 
-def log(level: str, msg: str):
-    getattr(_logger, level, _logger.info)(msg)
+def log(level: str, msg: str, *args):
+    getattr(_logger, level, _logger.info)(msg, *args)
@@ -263,6 +263,7 @@ def main():
     web.events = event_detector
     web.collector = collector
     web.vehicle_monitor = vehicle_monitor
+    vehicle_monitor.on_update = web.update_vehicles
     web.rl_devices = rl_devices
     web.manual_store = manual_store
     web.decision_log = decision_log
@@ -33,7 +33,7 @@ import numpy as np
 
 from config import Config
 from logging_util import log
-from state import DispatchSlot, PlanHorizon, SystemState
+from state import DispatchSlot, PlanHorizon, SystemState, parse_evcc_timestamp
 
 
 # Threshold in kW below which a continuous LP decision is treated as "off"
@@ -185,13 +185,7 @@ class HorizonPlanner:
                 start_str = t.get("start", "")
                 val = float(t.get("value", 0))
 
-                if start_str.endswith("Z"):
-                    start = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
-                elif "+" in start_str or start_str.count("-") > 2:
-                    start = datetime.fromisoformat(start_str)
-                else:
-                    start = datetime.fromisoformat(start_str).replace(tzinfo=timezone.utc)
-
+                start = parse_evcc_timestamp(start_str)
                 hour = start.replace(minute=0, second=0, microsecond=0)
                 if hour.timestamp() >= now_hour.timestamp() - 3600:
                     buckets[hour].append(val)
@@ -9,6 +9,7 @@ v5.0.2: Fixed ManualSocStore.get() returning dict instead of float.
 """
 
 import json
+import sys
 import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -286,6 +287,25 @@ class ManualSocStore:
             return self._data.copy()
 
 
+# =============================================================================
+# Timestamp parsing (tariff / forecast entries)
+# =============================================================================
+
+# datetime.fromisoformat accepts a trailing "Z" from Python 3.11 on
+_HAS_NATIVE_Z = sys.version_info >= (3, 11)
+
+
+def parse_evcc_timestamp(s: str) -> datetime:
+    """Parse an evcc ISO-8601 timestamp; naive values are taken as UTC.
+
+    Raises ValueError / TypeError / AttributeError for unparseable input.
+    """
+    start = datetime.fromisoformat(s if _HAS_NATIVE_Z or not s.endswith("Z") else s[:-1] + "+00:00")
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    return start
+
+
 # =============================================================================
 # Percentile calculation helper (used by main loop, LP, RL)
 # =============================================================================
@@ -330,13 +350,7 @@ def calc_solar_surplus_kwh(solar_forecast: List[Dict],
             val = float(t.get("value", 0))
             if val <= 0:
                 continue
-            if s.endswith("Z"):
-                start = datetime.fromisoformat(s.replace("Z", "+00:00"))
-            elif "+" in s:
-                start = datetime.fromisoformat(s)
-            else:
-                start = datetime.fromisoformat(s).replace(tzinfo=timezone.utc)
-            entries.append((start, val))
+            entries.append((parse_evcc_timestamp(s), val))
         except Exception:
             continue
 
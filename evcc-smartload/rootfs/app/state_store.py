@@ -43,6 +43,8 @@ class StateStore:
         self._rl_action: Optional[Action] = None
         self._solar_forecast: List[Dict] = []
         self._last_update: Optional[datetime] = None
+        # Bumped on every update(); lets readers detect unchanged state cheaply
+        self._revision: int = 0
 
         # --- v7: Forecast fields (guarded by _lock) ---
         self._consumption_forecast: Optional[List[float]] = None
@@ -103,6 +105,7 @@ class StateStore:
             self._rl_action = rl_action
             self._solar_forecast = list(solar_forecast) if solar_forecast else []
             self._last_update = datetime.now(timezone.utc)
+            self._revision += 1
             # v7: forecast fields
             self._consumption_forecast = list(consumption_forecast) if consumption_forecast else None
             self._pv_forecast = list(pv_forecast) if pv_forecast else None
@@ -156,6 +159,11 @@ class StateStore:
         with self._lock:
             return self._snapshot_unlocked()
 
+    def revision(self) -> int:
+        """Return the update counter; changes whenever update() stores new state."""
+        with self._lock:
+            return self._revision
+
     def _snapshot_unlocked(self) -> Dict:
         """Build snapshot dict; caller MUST hold self._lock."""
         snap = {
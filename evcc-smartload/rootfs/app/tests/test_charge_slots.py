@@ -0,0 +1,178 @@
+"""
+Tests for the /slots charge-slot helpers in web.server.
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Other test modules stub numpy when it is not yet imported; these helpers
+# need the real package.
+if isinstance(sys.modules.get("numpy"), MagicMock):
+    del sys.modules["numpy"]
+
+import numpy as np
+
+import web.server as server
+from web.slot_kernel import _pick_slots
+
+T0 = datetime(2026, 1, 15, 0, tzinfo=timezone.utc)
+
+
+def make_hourly(prices):
+    return [(T0 + timedelta(hours=i), p) for i, p in enumerate(prices)]
+
+
+def device_slots(hourly, kernel, soc=20, deadline=None, max_price_ct=30, power_kw=11):
+    """_device_slots for a 60 kWh device, with or without the slot kernel."""
+    with patch.object(server, "pick_slots", kernel):
+        return server._device_slots("EV", 60, soc, 80, power_kw, max_price_ct,
+                                    hourly, deadline, "🚗")
+
+
+def tz(hours, minutes=0):
+    return timezone(timedelta(hours=hours, minutes=minutes))
+
+
+class TestBucketHourly(unittest.TestCase):
+
+    def test_floor_in_own_offset(self):
+        cases = [
+            ("2026-01-15T10:45:00Z", datetime(2026, 1, 15, 10, tzinfo=timezone.utc)),
+            ("2026-01-15T10:45:00+01:00", datetime(2026, 1, 15, 10, tzinfo=tz(1))),
+            ("2026-01-15T10:45:00+05:30", datetime(2026, 1, 15, 10, tzinfo=tz(5, 30))),
+            ("2026-01-15T10:45:00-03:30", datetime(2026, 1, 15, 10, tzinfo=tz(-3, -30))),
+            ("2026-01-15T10:45:00", datetime(2026, 1, 15, 10, tzinfo=timezone.utc)),
+        ]
+        for start, hour in cases:
+            (got, value), = server._bucket_hourly(((start, 0.2),), since=T0)
+            self.assertEqual(got, hour, start)
+            self.assertEqual(got.utcoffset(), hour.utcoffset(), start)
+            self.assertEqual(value, 0.2)
+
+    def test_same_instant_in_different_offsets_shares_a_bucket(self):
+        series = (("2026-01-15T10:15:00Z", 0.1), ("2026-01-15T11:30:00+01:00", 0.3))
+        (hour, value), = server._bucket_hourly(series, since=T0)
+        self.assertEqual(hour, datetime(2026, 1, 15, 10, tzinfo=timezone.utc))
+        self.assertAlmostEqual(value, 0.2)
+
+    SHUFFLED = (
+        ("2026-01-15T11:15:00Z", 7.0),
+        ("2026-01-15T10:30:00Z", 3.0),
+        ("2026-01-15T10:00:00Z", 1.0),
+        ("2026-01-15T11:00:00Z", 5.0),
+        ("2026-01-15T10:45:00Z", 4.0),
+        ("2026-01-15T10:15:00Z", 2.0),
+    )
+
+    def test_mean_on_unordered_input(self):
+        self.assertEqual(server._bucket_hourly(self.SHUFFLED, since=T0), [
+            (datetime(2026, 1, 15, 10, tzinfo=timezone.utc), 2.5),
+            (datetime(2026, 1, 15, 11, tzinfo=timezone.utc), 6.0),
+        ])
+
+    def test_max_on_unordered_input(self):
+        self.assertEqual(server._bucket_hourly(self.SHUFFLED, since=T0, reduce="max"), [
+            (datetime(2026, 1, 15, 10, tzinfo=timezone.utc), 4.0),
+            (datetime(2026, 1, 15, 11, tzinfo=timezone.utc), 7.0),
+        ])
+
+    def test_hours_before_since_dropped(self):
+        since = datetime(2026, 1, 15, 11, tzinfo=timezone.utc)
+        self.assertEqual([h.hour for h, _ in server._bucket_hourly(self.SHUFFLED, since=since)], [11])
+
+    def test_unparseable_entries_skipped(self):
+        series = (("", 0.3), (None, 0.3), ("2026-01-15T10:00:00Z", None), ("2026-01-15T10:00:00Z", 0.2))
+        self.assertEqual(server._bucket_hourly(series, since=T0),
+                         [(datetime(2026, 1, 15, 10, tzinfo=timezone.utc), 0.2)])
+
+
+class TestDeviceSlotSelection(unittest.TestCase):
+
+    def test_deadline_cutoff(self):
+        # Cheapest hours sit at and after the deadline; they must not be picked
+        hourly = make_hourly([0.20] * 6 + [0.05] * 18)
+        result = device_slots(hourly, None, deadline=T0 + timedelta(hours=6))
+        hours = [s["hour"] for s in result["slots"]]
+        self.assertTrue(hours)
+        self.assertTrue(all(h < "06:00" for h in hours), hours)
+
+    def test_without_deadline_only_next_24_hours(self):
+        hourly = make_hourly([0.25] * 24 + [0.05] * 24)
+        result = device_slots(hourly, None)
+        self.assertTrue(all(s["price_ct"] == 25.0 for s in result["slots"]))
+
+    def test_ties_keep_hour_order(self):
+        result = device_slots(make_hourly([0.15] * 24), None)
+        n = result["hours_needed"]
+        self.assertEqual([s["hour"] for s in result["slots"]],
+                         [f"{h:02d}:00" for h in range(n)])
+
+
+class TestPickSlotsKernel(unittest.TestCase):
+
+    def test_cheapest_hours_in_hour_order(self):
+        prices = np.array([0.30, 0.10, 0.25, 0.05, 0.20])
+        idx, kwh_per, total_cost, avg_ct, max_ct = _pick_slots(prices, 3, 30.0)
+        self.assertEqual(idx.tolist(), [1, 3, 4])
+        self.assertEqual(kwh_per, 10.0)
+        self.assertAlmostEqual(total_cost, 10.0 * (0.10 + 0.05 + 0.20))
+        self.assertAlmostEqual(avg_ct, (0.10 + 0.05 + 0.20) / 3 * 100)
+        self.assertAlmostEqual(max_ct, 20.0)
+
+    def test_ties_keep_hour_order(self):
+        prices = np.array([0.20, 0.10, 0.10, 0.30, 0.10])
+        idx, *_ = _pick_slots(prices, 2, 10.0)
+        self.assertEqual(idx.tolist(), [1, 2])
+
+    def test_fewer_hours_than_needed(self):
+        prices = np.array([0.20, 0.10])
+        idx, kwh_per, *_ = _pick_slots(prices, 5, 30.0)
+        self.assertEqual(idx.tolist(), [0, 1])
+        self.assertEqual(kwh_per, 15.0)
+
+    def test_no_hours_needed(self):
+        idx, kwh_per, total_cost, avg_ct, max_ct = _pick_slots(np.array([0.2, 0.1]), 0, 0.0)
+        self.assertEqual(idx.size, 0)
+        self.assertEqual((kwh_per, total_cost, avg_ct, max_ct), (0.0, 0.0, 0.0, 0.0))
+
+
+class TestKernelMatchesFallback(unittest.TestCase):
+    """The kernel path of _device_slots must give the numpy fallback's result."""
+
+    def assertSamePaths(self, hourly, **kwargs):
+        kernel = device_slots(hourly, _pick_slots, **kwargs)
+        fallback = device_slots(hourly, None, **kwargs)
+        self.assertEqual(kernel, fallback)
+        return fallback
+
+    def test_ties(self):
+        result = self.assertSamePaths(make_hourly([0.20, 0.10, 0.10, 0.25, 0.10, 0.10, 0.29] * 4))
+        self.assertTrue(result["slots"])
+
+    def test_too_few_eligible_hours(self):
+        result = self.assertSamePaths(make_hourly([0.35, 0.12, 0.40, 0.15] + [0.50] * 20))
+        self.assertEqual([s["hour"] for s in result["slots"]], ["01:00", "03:00"])
+        self.assertTrue(result["status"].startswith("⚠️ Nur 2/"))
+
+    def test_no_eligible_hours(self):
+        result = self.assertSamePaths(make_hourly([0.50] * 24))
+        self.assertEqual(result["slots"], [])
+
+    def test_hours_needed_zero(self):
+        result = self.assertSamePaths(make_hourly([0.10] * 24), soc=80)
+        self.assertEqual(result["hours_needed"], 0)
+        self.assertEqual(result["slots"], [])
+
+    def test_with_deadline(self):
+        hourly = make_hourly([0.28, 0.11, 0.19, 0.11, 0.25, 0.14, 0.08, 0.22] * 3)
+        self.assertSamePaths(hourly, deadline=T0 + timedelta(hours=9))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests for VehicleManager evcc loadpoint matching.
+"""
+
+import sys
+import os
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from vehicles.manager import VehicleManager
+
+
+def make_manager(*names):
+    return VehicleManager([{"name": n, "type": "evcc", "capacity_kwh": 60} for n in names])
+
+
+def make_evcc_state(vehicle_name, connected=True, charging=False, soc=55):
+    return {"loadpoints": [{
+        "vehicleName": vehicle_name,
+        "connected": connected,
+        "charging": charging,
+        "vehicleSoc": soc,
+    }]}
+
+
+class TestMatchVehicle(unittest.TestCase):
+
+    def test_exact_name(self):
+        mgr = make_manager("KIA_EV9", "Twingo")
+        self.assertEqual(mgr._match_vehicle("Twingo"), "Twingo")
+
+    def test_case_whitespace_and_punctuation_ignored(self):
+        mgr = make_manager("KIA_EV9")
+        self.assertEqual(mgr._match_vehicle("kia ev9 "), "KIA_EV9")
+        self.assertEqual(mgr._match_vehicle("Kia-EV9"), "KIA_EV9")
+
+    def test_umlauts_preserved(self):
+        mgr = make_manager("Müller")
+        self.assertEqual(mgr._match_vehicle("MÜLLER"), "Müller")
+        self.assertIsNone(mgr._match_vehicle("Mller"))
+
+    def test_unknown_name(self):
+        mgr = make_manager("KIA_EV9")
+        self.assertIsNone(mgr._match_vehicle("ORA_03"))
+
+
+class TestUpdateFromEvcc(unittest.TestCase):
+
+    def test_connected_vehicle_gets_soc(self):
+        mgr = make_manager("KIA_EV9", "Twingo")
+        mgr.update_from_evcc(make_evcc_state("kia ev9", charging=True, soc=42))
+        kia = mgr.get_vehicle("KIA_EV9")
+        self.assertTrue(kia.connected_to_wallbox)
+        self.assertTrue(kia.charging)
+        self.assertEqual(kia.soc, 42.0)
+        self.assertIsInstance(kia.soc, float)
+        self.assertFalse(mgr.get_vehicle("Twingo").connected_to_wallbox)
+
+    def test_vehicle_reset_when_unplugged(self):
+        mgr = make_manager("KIA_EV9")
+        mgr.update_from_evcc(make_evcc_state("KIA_EV9", charging=True))
+        mgr.update_from_evcc({"loadpoints": [{"vehicleName": "", "connected": False}]})
+        kia = mgr.get_vehicle("KIA_EV9")
+        self.assertFalse(kia.connected_to_wallbox)
+        self.assertFalse(kia.charging)
+        self.assertEqual(kia.soc, 55.0)
+
+    def test_unknown_vehicle_cached_as_miss(self):
+        mgr = make_manager("KIA_EV9")
+        mgr.update_from_evcc(make_evcc_state("Guest"))
+        mgr.update_from_evcc(make_evcc_state("Guest"))
+        self.assertIn("Guest", mgr._name_norm_cache)
+        self.assertIsNone(mgr._name_norm_cache["Guest"])
+        self.assertFalse(mgr.get_vehicle("KIA_EV9").connected_to_wallbox)
+
+
+class TestFindVehicle(unittest.TestCase):
+
+    def test_canonical_match(self):
+        mgr = make_manager("VW_ID.3", "Twingo")
+        self.assertIs(mgr.find_vehicle("vw id 3"), mgr.get_vehicle("VW_ID.3"))
+
+    def test_no_match(self):
+        mgr = make_manager("VW_ID.3")
+        self.assertIsNone(mgr.find_vehicle("ID.4"))
+        self.assertIsNone(mgr.find_vehicle(None))
+        self.assertIsNone(mgr.find_vehicle(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
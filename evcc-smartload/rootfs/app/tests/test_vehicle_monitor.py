@@ -0,0 +1,83 @@
+"""
+Tests for VehicleMonitor's /vehicles snapshot publishing.
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from config import Config
+import vehicle_monitor
+from vehicle_monitor import DataCollector, VehicleMonitor
+
+
+def make_monitor(name="KIA_EV9", capacity_kwh=60):
+    cfg = Config()
+    cfg.vehicle_providers = [{"name": name, "type": "evcc", "capacity_kwh": capacity_kwh}]
+    manual_store = MagicMock()
+    manual_store.get.return_value = None
+    monitor = VehicleMonitor(MagicMock(), cfg, manual_store)
+    monitor.on_update = MagicMock()
+    return monitor
+
+
+def evcc_state(soc):
+    return {"loadpoints": [{"vehicleName": "KIA_EV9", "connected": True,
+                            "charging": False, "vehicleSoc": soc}]}
+
+
+class TestPublish(unittest.TestCase):
+
+    def test_unchanged_data_published_once(self):
+        # Vehicle not at the wallbox and never polled: evcc updates change nothing
+        monitor = make_monitor()
+        for _ in range(3):
+            monitor.update_from_evcc({"loadpoints": []})
+        monitor.on_update.assert_called_once()
+        self.assertFalse(monitor.on_update.call_args[0][0]["vehicles"]["KIA_EV9"]["connected"])
+
+    def test_changed_data_published_again(self):
+        monitor = make_monitor()
+        monitor.update_from_evcc(evcc_state(40))
+        monitor.update_from_evcc(evcc_state(45))
+        self.assertEqual(monitor.on_update.call_count, 2)
+        self.assertEqual(monitor.on_update.call_args[0][0]["vehicles"]["KIA_EV9"]["soc"], 45.0)
+
+    def test_snapshot_does_not_log_stale_warnings(self):
+        monitor = make_monitor()
+        with patch.object(vehicle_monitor, "log") as log:
+            # Never polled: the vehicle's SoC data counts as stale
+            monitor.get_vehicles_snapshot()
+            monitor.update_from_evcc({"loadpoints": []})
+        self.assertFalse([c for c in log.call_args_list if c[0][0] == "warning"])
+
+    def test_planning_path_still_warns_on_stale_data(self):
+        monitor = make_monitor()
+        with patch.object(vehicle_monitor, "log") as log:
+            needs = monitor.predict_charge_need()
+        self.assertIn("KIA_EV9", needs)
+        self.assertTrue([c for c in log.call_args_list if c[0][0] == "warning"])
+
+
+class TestDataCollectorVehicleLookup(unittest.TestCase):
+
+    def test_evcc_name_matched_canonically(self):
+        monitor = make_monitor("VW_ID.3", capacity_kwh=77)
+        evcc = MagicMock()
+        evcc.get_state.return_value = {"loadpoints": [
+            {"vehicleName": "vw id 3", "connected": True, "charging": False, "vehicleSoc": 55}]}
+        evcc.get_current_tariff.return_value = 0.3
+        collector = DataCollector(evcc, None, monitor.cfg, monitor)
+        collector._collect_once()
+        state = collector.get_current_state()
+        self.assertEqual(state.ev_name, "vw id 3")
+        self.assertEqual(state.ev_capacity_kwh, 77.0)
+        self.assertEqual(state.ev_soc, 55.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Tests for the web server's precomputed pages and cache headers.
+"""
+
+import os
+import re
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Other test modules stub numpy when it is not yet imported; the web server
+# needs the real package.
+if isinstance(sys.modules.get("numpy"), MagicMock):
+    del sys.modules["numpy"]
+
+from config import Config
+from state import SystemState
+from state_store import StateStore
+import web.server as server
+
+
+def make_server(static_dir: Path) -> server.WebServer:
+    with patch.object(server, "STATIC_DIR", static_dir):
+        return server.WebServer(Config(), MagicMock())
+
+
+class TestDashboardAppJsRev(unittest.TestCase):
+
+    SCRIPT = re.compile(r'<script src="/static/app\.js\?v=([^"]*)"></script>')
+
+    def _script_rev(self, js: bytes):
+        with tempfile.TemporaryDirectory() as d:
+            Path(d, "app.js").write_bytes(js)
+            srv = make_server(Path(d))
+        m = self.SCRIPT.search(srv._dashboard_html.decode())
+        self.assertIsNotNone(m, "script tag not rendered with a well-formed src")
+        return m.group(1), srv._static_cache["app.js"][2]
+
+    def test_script_url_carries_bare_digest(self):
+        rev, etag = self._script_rev(b"console.log(1);")
+        self.assertRegex(rev, r"^[0-9a-f]+$")
+        self.assertEqual(f'"{rev}"', etag)
+
+    def test_script_url_changes_with_app_js(self):
+        rev_a, _ = self._script_rev(b"console.log(1);")
+        rev_b, _ = self._script_rev(b"console.log(2);")
+        self.assertNotEqual(rev_a, rev_b)
+
+
+class TestStatusEtag(unittest.TestCase):
+    """Every input /status reads must move its ETag."""
+
+    def setUp(self):
+        self.srv = server.WebServer(Config(), StateStore())
+        self.srv.rl = SimpleNamespace(epsilon=0.5, total_steps=10, memory=[], q_table={})
+        self.comparison = {"comparisons": 3, "win_rate": 0.3, "rl_ready": False,
+                           "lp_total_cost": 1.5, "rl_total_cost": 1.7}
+        self.srv.comparator = MagicMock()
+        self.srv.comparator.get_status.side_effect = lambda: dict(self.comparison)
+
+    def assertChanges(self, mutate):
+        before = self.srv._status_etag()
+        mutate()
+        self.assertNotEqual(self.srv._status_etag(), before)
+
+    def test_stable_without_changes(self):
+        self.assertEqual(self.srv._status_etag(), self.srv._status_etag())
+
+    def test_state_store_update(self):
+        state = SystemState(timestamp=datetime.now(timezone.utc), battery_soc=50, battery_power=0,
+                            grid_power=0, current_price=0.25, pv_power=0, home_power=500,
+                            ev_connected=False, ev_soc=0, ev_power=0)
+        self.assertChanges(lambda: self.srv._store.update(state=state, lp_action=None, rl_action=None))
+
+    def test_vehicle_publish_keeps_etag(self):
+        # /status does not read vehicle data
+        before = self.srv._status_etag()
+        self.srv.update_vehicles({"vehicles": {}, "total_charge_needed_kwh": 0})
+        self.assertEqual(self.srv._status_etag(), before)
+
+    def test_new_process_never_matches_old_etags(self):
+        restarted = server.WebServer(Config(), StateStore())
+        restarted.rl, restarted.comparator = self.srv.rl, self.srv.comparator
+        self.assertNotEqual(restarted._status_etag(), self.srv._status_etag())
+        self.assertNotEqual(restarted._chart_data_etag([]), self.srv._chart_data_etag([]))
+
+    def test_rl_agent_fields(self):
+        rl = self.srv.rl
+        self.assertChanges(lambda: setattr(rl, "epsilon", 0.49))
+        self.assertChanges(lambda: setattr(rl, "total_steps", 11))
+        self.assertChanges(lambda: rl.memory.append(None))
+        self.assertChanges(lambda: rl.q_table.__setitem__((1,), None))
+
+    def test_comparator_status(self):
+        for field, value in (("comparisons", 4), ("win_rate", 0.5), ("rl_ready", True),
+                             ("lp_total_cost", 1.6), ("rl_total_cost", 1.8)):
+            self.assertChanges(lambda: self.comparison.__setitem__(field, value))
+
+    def test_late_wiring(self):
+        self.assertChanges(lambda: setattr(self.srv, "sequencer", object()))
+        self.assertChanges(lambda: setattr(self.srv, "driver_mgr", SimpleNamespace(telegram_enabled=True)))
+
+
+class TestPrettyJson(unittest.TestCase):
+
+    def _body(self, path: str) -> bytes:
+        handler = server._SmartloadHandler.__new__(server._SmartloadHandler)
+        handler.path = path
+        handler._json_bytes = MagicMock()
+        handler._json({"a": 1})
+        return handler._json_bytes.call_args[0][0]
+
+    def test_pretty_flag_indents(self):
+        self.assertIn(b"\n", self._body("/status?pretty=1"))
+        self.assertIn(b"\n", self._body("/status?x=2&pretty=1"))
+
+    def test_compact_by_default(self):
+        self.assertNotIn(b"\n", self._body("/status"))
+
+    def test_pretty_requires_exact_parameter(self):
+        for path in ("/status?pretty=10", "/status?xpretty=1", "/pretty=1/status"):
+            self.assertNotIn(b"\n", self._body(path), path)
+
+
+if __name__ == "__main__":
+    unittest.main()
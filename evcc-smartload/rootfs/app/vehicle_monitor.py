@@ -3,7 +3,7 @@ Vehicle Monitor and Data Collector — v6 (Phase 9 fix).
 
 VehicleMonitor:
   - Manages vehicle state, handles polling schedule
-  - Exposes get_all_vehicles(), predict_charge_need(), trigger_refresh()
+  - Exposes get_all_vehicles(), find_vehicle(), predict_charge_need(), trigger_refresh()
   - evcc-live suppression: skips API poll when vehicle is at wallbox
   - Per-vehicle poll intervals from vehicles.yaml config
   - Backoff-aware: skips vehicles in backoff state
@@ -17,7 +17,7 @@ DataCollector:
 import threading
 import time
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from typing import Callable, Dict, Mapping, Optional
 
 from config import Config
 from logging_util import log
@@ -40,6 +40,9 @@ class VehicleMonitor:
         self._last_poll: Dict[str, float] = {}
         self._prev_connected: Dict[str, bool] = {}
         self._thread: Optional[threading.Thread] = None
+        # Receives the /vehicles API snapshot whenever it changes (wired late by main.py)
+        self.on_update: Optional[Callable[[dict], None]] = None
+        self._last_published: Optional[dict] = None
 
     def _get_poll_interval(self, name: str) -> float:
         """Return poll interval in seconds for a vehicle (per-vehicle or global)."""
@@ -54,7 +57,7 @@ class VehicleMonitor:
         # Do first poll synchronously so errors are visible at startup
         pollable = self._manager.get_pollable_names()
         if pollable:
-            log("info", f"VehicleMonitor: initial poll for {len(pollable)} vehicle(s): {pollable}")
+            log("info", f"VehicleMonitor: initial poll for {len(pollable)} vehicle(s): {sorted(pollable)}")
             for name in pollable:
                 try:
                     log("info", f"VehicleMonitor: polling {name}...")
@@ -135,6 +138,7 @@ class VehicleMonitor:
                     manual = self.manual_store.get(name)
                     v.manual_soc = manual
 
+                self._publish()
             except Exception as e:
                 log("error", f"VehicleMonitor poll loop error: {e}")
 
@@ -150,33 +154,90 @@ class VehicleMonitor:
                 v.manual_soc = manual
 
             # Connection-event detection: trigger immediate API refresh on connect
-            pollable = set(self._manager.get_pollable_names())
+            pollable = self._manager.get_pollable_names()
             for name, v in self._manager.get_all_vehicles().items():
                 was_connected = self._prev_connected.get(name, False)
                 if v.connected_to_wallbox and not was_connected and name in pollable:
                     log("info", f"VehicleMonitor: {name} connected -- triggering immediate SoC refresh")
                     self.trigger_refresh(name)
                 self._prev_connected[name] = v.connected_to_wallbox
+
+            self._publish()
         except Exception as e:
             log("error", f"VehicleMonitor update_from_evcc error: {e}")
 
-    def get_all_vehicles(self) -> Dict[str, VehicleData]:
-        """Return all configured vehicles with current data."""
+    def get_all_vehicles(self) -> Mapping[str, VehicleData]:
+        """Return all configured vehicles with current data (read-only view)."""
         return self._manager.get_all_vehicles()
 
+    def find_vehicle(self, evcc_name: Optional[str]) -> Optional[VehicleData]:
+        """Return the configured vehicle matching an evcc vehicle name, if any."""
+        return self._manager.find_vehicle(evcc_name)
+
     def predict_charge_need(self) -> Dict[str, float]:
-        """Estimate kWh needed to reach target SoC for each vehicle."""
-        target = self.cfg.ev_target_soc
-        result = {}
+        """Estimate kWh needed to reach target SoC for each vehicle (LP planning)."""
         for name, v in self._manager.get_all_vehicles().items():
             if v.is_data_stale():
                 log("warning", f"VehicleMonitor: {name} SoC data is stale — using last known value for LP planning")
+        return self._charge_needs()
+
+    def _charge_needs(self) -> Dict[str, float]:
+        """kWh needed to reach target SoC per vehicle, without staleness warnings."""
+        target = self.cfg.ev_target_soc
+        result = {}
+        for name, v in self._manager.get_all_vehicles().items():
             soc = v.get_effective_soc()
             cap = v.capacity_kwh or self.cfg.ev_default_energy_kwh
             need = max(0, (target - soc) / 100 * cap)
             result[name] = round(need, 1)
         return result
 
+    def get_vehicles_snapshot(self) -> dict:
+        """Build the /vehicles API payload for all enabled vehicles."""
+        needs = self._charge_needs()
+        vehicles = {}
+        for name, v in self.get_all_vehicles().items():
+            if self._manager.get_vehicle_config(name).get("disabled", False):
+                continue
+            vehicles[name] = {
+                "soc": v.get_effective_soc(),
+                "raw_soc": v.soc,
+                "manual_soc": v.manual_soc,
+                "capacity_kwh": v.capacity_kwh,
+                "range_km": v.range_km,
+                "connected": v.connected_to_wallbox,
+                "charging": v.charging,
+                "charge_needed_kwh": needs.get(name, 0),
+                "data_source": v.data_source,
+                # datetimes are encoded as ISO-8601 by the web server's JSON encoder
+                "last_update": v.last_update,
+                "last_poll": v.last_poll,
+                "last_successful_poll": v.last_successful_poll,
+                "freshness": v.freshness,
+                "poll_age": v.get_poll_age_string(),
+                "data_age": v.get_data_age_string(),
+                "is_stale": v.is_data_stale(),
+            }
+        return {
+            "vehicles": vehicles,
+            "total_charge_needed_kwh": sum(
+                v for n, v in needs.items()
+                if not self._manager.get_vehicle_config(n).get("disabled", False)
+            ),
+        }
+
+    def _publish(self):
+        """Push the vehicles snapshot to the registered consumer if it changed."""
+        if self.on_update is None:
+            return
+        # Build and push under the lock: poll loop and DataCollector both publish
+        with self._lock:
+            snapshot = self.get_vehicles_snapshot()
+            if snapshot == self._last_published:
+                return
+            self._last_published = snapshot
+            self.on_update(snapshot)
+
     def trigger_refresh(self, vehicle_name: Optional[str] = None):
         """Request immediate re-poll for a vehicle (or all if None)."""
         with self._lock:
@@ -278,13 +339,11 @@ class DataCollector:
                 ev_soc = float(lp.get("vehicleSoc", 0) or 0)
                 ev_connected = True
                 # Try to get capacity from our vehicle data
-                vehicles = self.vehicle_monitor.get_all_vehicles()
-                for vname, vdata in vehicles.items():
-                    if vname.lower() == (ev_name or "").lower():
-                        ev_cap = vdata.capacity_kwh or 0
-                        # Use best available SoC
-                        ev_soc = vdata.get_effective_soc()
-                        break
+                vdata = self.vehicle_monitor.find_vehicle(ev_name)
+                if vdata is not None:
+                    ev_cap = vdata.capacity_kwh or 0
+                    # Use best available SoC
+                    ev_soc = vdata.get_effective_soc()
                 break
 
         state = SystemState(
@@ -5,7 +5,9 @@ Initializes vehicle providers from config and coordinates SoC data.
 Supports disabled vehicles and per-vehicle config access.
 """
 
-from typing import Dict, List, Optional
+import re
+from types import MappingProxyType
+from typing import AbstractSet, Dict, List, Mapping, Optional
 
 from logging_util import log
 from vehicles.base import VehicleData
@@ -14,51 +16,83 @@ from vehicles.kia_provider import KiaProvider
 from vehicles.renault_provider import RenaultProvider
 from vehicles.custom_provider import CustomProvider
 
+# Upper bound for the evcc vehicle name → config name cache
+_NAME_CACHE_MAX = 256
+
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+def _canonical_name(name: str) -> str:
+    """Canonical form for name matching: casefolded, punctuation/whitespace removed."""
+    return _NON_ALNUM.sub("", name.casefold())
+
+
+# Provider type → provider class ("manual" = SoC via dashboard manual input or evcc wallbox only)
+_PROVIDERS = {
+    "kia": KiaProvider,
+    "hyundai": KiaProvider,
+    "genesis": KiaProvider,
+    "renault": RenaultProvider,
+    "custom": CustomProvider,
+    "evcc": EvccProvider,
+    "manual": EvccProvider,
+}
+
 
 def _make_provider(config: dict):
     """Factory: create provider based on config type."""
     ptype = config.get("type", config.get("template", "evcc")).lower()
-
-    if ptype in ("kia", "hyundai", "genesis"):
-        return KiaProvider(config)
-    elif ptype == "renault":
-        return RenaultProvider(config)
-    elif ptype == "custom":
-        return CustomProvider(config)
-    elif ptype in ("evcc", "manual"):
-        # "manual" = SoC via dashboard manual input or evcc wallbox only
-        return EvccProvider(config)
-    else:
-        log("warning", f"Unknown provider type '{ptype}' for {config.get('name', '?')} — using evcc fallback")
-        return EvccProvider(config)
+    provider_cls = _PROVIDERS.get(ptype)
+    if provider_cls is None:
+        log("warning", "Unknown provider type '%s' for %s — using evcc fallback", ptype, config.get("name", "?"))
+        provider_cls = EvccProvider
+    return provider_cls(config)
 
 
 class VehicleManager:
     """Manages all configured vehicle providers."""
 
+    __slots__ = ("providers", "_vehicle_data", "_vehicle_data_view", "_vehicle_configs",
+                 "_pollable", "_name_norm_cache", "_canon_to_name")
+
     def __init__(self, vehicle_configs: List[dict]):
         self.providers: Dict[str, object] = {}   # evcc_name → provider
         self._vehicle_data: Dict[str, VehicleData] = {}
         self._vehicle_configs: Dict[str, dict] = {}   # name → raw config
+        self._name_norm_cache: Dict[str, Optional[str]] = {}   # raw evcc name → matched name
 
         for cfg in vehicle_configs:
             name = cfg.get("evcc_name") or cfg.get("name", "unknown")
             self._vehicle_configs[name] = cfg
             try:
                 provider = _make_provider(cfg)
-                self.providers[name] = provider
                 # Initialize empty VehicleData shell
-                if hasattr(provider, "make_vehicle_data"):
-                    self._vehicle_data[name] = provider.make_vehicle_data()
+                make_vehicle_data = getattr(provider, "make_vehicle_data", None)
+                if make_vehicle_data is not None:
+                    data = make_vehicle_data()
                 else:
-                    self._vehicle_data[name] = VehicleData(
+                    data = VehicleData(
                         name=name,
                         capacity_kwh=float(cfg.get("capacity_kwh", cfg.get("capacity", 30))),
                         charge_power_kw=float(cfg.get("charge_power_kw", 11)),
                         provider_type=cfg.get("type", "evcc"),
                     )
+                self.providers[name] = provider
+                self._vehicle_data[name] = data
             except Exception as e:
-                log("error", f"Failed to init provider for {name}: {e}")
+                log("error", "Failed to init provider for %s: %s", name, e)
+
+        self._vehicle_data_view: Mapping[str, VehicleData] = MappingProxyType(self._vehicle_data)
+        self._pollable: AbstractSet[str] = frozenset(
+            name for name, p in self.providers.items()
+            if getattr(p, "supports_active_poll", False)
+            and not self._vehicle_configs.get(name, {}).get("disabled", False)
+        )
+
+        # Canonical name → configured name (first one wins on collisions)
+        self._canon_to_name: Dict[str, str] = {}
+        for name in self._vehicle_data:
+            self._canon_to_name.setdefault(_canonical_name(name), name)
 
         log("info", f"VehicleManager: {len(self.providers)} vehicle(s) configured")
 
@@ -87,8 +121,16 @@ class VehicleManager:
     def get_vehicle(self, name: str) -> Optional[VehicleData]:
         return self._vehicle_data.get(name)
 
-    def get_all_vehicles(self) -> Dict[str, VehicleData]:
-        return dict(self._vehicle_data)
+    def get_all_vehicles(self) -> Mapping[str, VehicleData]:
+        """Read-only live view of all vehicles."""
+        return self._vehicle_data_view
+
+    def find_vehicle(self, evcc_name: Optional[str]) -> Optional[VehicleData]:
+        """Vehicle matching an evcc vehicle name, using the same matching as update_from_evcc."""
+        if not evcc_name:
+            return None
+        name = self._match_vehicle(evcc_name)
+        return self._vehicle_data.get(name) if name else None
 
     def update_from_evcc(self, evcc_state: dict):
         """Update vehicle connectivity and SoC from evcc loadpoint state."""
@@ -97,16 +139,18 @@ class VehicleManager:
         if not loadpoints:
             log("debug", "evcc: no loadpoints in state response")
 
-        # Mark all disconnected first — preserve last_poll and API soc
-        for v in self._vehicle_data.values():
-            v.connected_to_wallbox = False
-            v.charging = False
+        vdata = self._vehicle_data
+        match = self._match_vehicle
+        name_cache = self._name_norm_cache
 
+        # Pass 1: match loadpoints → matched name → (connected, charging, soc)
+        seen: Dict[str, tuple] = {}
         for i, lp in enumerate(loadpoints):
-            vehicle_name = lp.get("vehicleName") or lp.get("vehicle", "")
-            connected = lp.get("connected", False)
-            charging = lp.get("charging", False)
-            evcc_soc = lp.get("vehicleSoc")
+            lp_get = lp.get
+            vehicle_name = lp_get("vehicleName") or lp_get("vehicle", "")
+            connected = lp_get("connected", False)
+            charging = lp_get("charging", False)
+            evcc_soc = lp_get("vehicleSoc")
 
             if connected and vehicle_name:
                 log("info", f"evcc LP{i}: {vehicle_name} connected={connected} "
@@ -115,34 +159,44 @@ class VehicleManager:
             if not vehicle_name:
                 continue
 
-            # Case-insensitive match
-            matched = self._match_vehicle(vehicle_name)
+            # Canonical-name match (cached per raw evcc name)
+            matched = name_cache.get(vehicle_name)
+            if matched is None and vehicle_name not in name_cache:
+                matched = match(vehicle_name)
+                if len(name_cache) >= _NAME_CACHE_MAX:
+                    name_cache.clear()
+                name_cache[vehicle_name] = matched
             if matched is None:
                 if connected:
                     log("warning", f"evcc LP{i}: vehicle '{vehicle_name}' not in config "
-                                   f"(configured: {list(self._vehicle_data.keys())})")
+                                   f"(configured: {list(vdata.keys())})")
+                continue
+
+            seen[matched] = (connected, charging, evcc_soc)
+
+        # Pass 2: apply loadpoint state, unmatched vehicles are marked
+        # disconnected — preserve last_poll and API soc
+        for name, vd in vdata.items():
+            lp_state = seen.get(name)
+            if lp_state is None:
+                vd.connected_to_wallbox = False
+                vd.charging = False
                 continue
 
-            vd = self._vehicle_data[matched]
+            connected, charging, evcc_soc = lp_state
             vd.connected_to_wallbox = connected
             vd.charging = charging
 
             # SoC from evcc (only when connected)
-            if evcc_soc is not None and vd.connected_to_wallbox:
-                vd.update_from_evcc(float(evcc_soc), vd.connected_to_wallbox, vd.charging)
+            if evcc_soc is not None and connected:
+                if not isinstance(evcc_soc, float):
+                    evcc_soc = float(evcc_soc)
+                vd.update_from_evcc(evcc_soc, connected, charging)
 
     def _match_vehicle(self, name: str) -> Optional[str]:
-        """Find configured vehicle name matching evcc vehicle name (case-insensitive)."""
-        nl = name.lower()
-        for k in self._vehicle_data:
-            if k.lower() == nl:
-                return k
-        return None
-
-    def get_pollable_names(self) -> List[str]:
+        """Find configured vehicle name matching evcc vehicle name (ignores case, spaces, punctuation)."""
+        return self._canon_to_name.get(_canonical_name(name))
+
+    def get_pollable_names(self) -> AbstractSet[str]:
         """Return names of vehicles that support active API polling and are not disabled."""
-        return [
-            name for name, p in self.providers.items()
-            if getattr(p, "supports_active_poll", False)
-            and not self._vehicle_configs.get(name, {}).get("disabled", False)
-        ]
+        return self._pollable
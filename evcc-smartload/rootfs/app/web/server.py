@@ -17,31 +17,154 @@ v5 features preserved:
   - Existing endpoints fully backward-compatible
 """
 
+import gzip
+import hashlib
 import json
 import queue
 import re
 import socketserver
+import statistics
 import threading
 import time
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse, parse_qs
 
+import numpy as np
+
 from config import Config
 from explanation_generator import ExplanationGenerator
 from logging_util import log
-from state import Action, ManualSocStore, SystemState, calc_solar_surplus_kwh
+from state import Action, ManualSocStore, SystemState, calc_solar_surplus_kwh, parse_evcc_timestamp
 from state_store import StateStore
 from version import VERSION
 
+from web.slot_kernel import pick_slots
 from web.template_engine import render as render_template
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
 
 STATIC_DIR = Path(__file__).parent / "static"
 
+# Response bodies above this size are written to the socket in chunks
+_CHUNKED_WRITE_MIN = 64 * 1024
+_WRITE_CHUNK = 16 * 1024
+
+# JSON/HTML bodies below this size are sent uncompressed
+_COMPRESS_MIN = 1024
+
+# Parsed tariff/solar series kept by _bucket_hourly (cleared when full)
+_SERIES_CACHE_MAX = 8
+
+# Minimal markdown → HTML rules for /docs pages
+_RE_H1 = re.compile(r"^# (.+)$", re.M)
+_RE_H2 = re.compile(r"^## (.+)$", re.M)
+_RE_H3 = re.compile(r"^### (.+)$", re.M)
+_RE_FENCE = re.compile(r"```(\w+)?\n(.*?)\n```", re.S)
+_RE_CODE = re.compile(r"`([^`]+)`")
+_RE_LINK = re.compile(r"\[([^\]]+)\]\(([^\)]+)\)")
+_RE_BOLD = re.compile(r"\*\*([^\*]+)\*\*")
+_RE_ITALIC = re.compile(r"\*([^\*]+)\*")
+
+
+_ORJSON_OPT = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    if orjson is not None else 0
+)
+
+
+def _json_default(obj):
+    """Fallback encoder: datetimes as ISO-8601 (as orjson does natively), else str()."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _json_dumps(data, pretty: bool = False) -> bytes:
+    """Serialize an API response to UTF-8 JSON bytes (orjson when available).
+
+    Output is compact unless `pretty` is set. API builders may hand over raw
+    datetime objects; both encoders emit them in datetime.isoformat() form.
+    """
+    if orjson is not None:
+        option = _ORJSON_OPT | orjson.OPT_INDENT_2 if pretty else _ORJSON_OPT
+        return orjson.dumps(data, option=option, default=str)
+    if pretty:
+        return json.dumps(data, indent=2, default=_json_default).encode()
+    return json.dumps(data, separators=(",", ":"), default=_json_default).encode()
+
+
+# Constant bodies for optional components that are not configured
+_SEQUENCER_DISABLED_JSON = _json_dumps({"enabled": False})
+_DRIVERS_DISABLED_JSON = _json_dumps({"enabled": False, "drivers": []})
+
+
+def _compress(buf: bytes, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+    """Compress a response body for the client's Accept-Encoding (br > gzip).
+
+    Returns the body and the Content-Encoding to send (None = identity).
+    """
+    if len(buf) < _COMPRESS_MIN or not accept_encoding:
+        return buf, None
+    accepted = {e.split(";", 1)[0].strip() for e in accept_encoding.lower().split(",")}
+    if brotli is not None and "br" in accepted:
+        return brotli.compress(buf, quality=4), "br"
+    if "gzip" in accepted:
+        return gzip.compress(buf, compresslevel=1), "gzip"
+    return buf, None
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso(s: str) -> datetime:
+    """Parse an evcc ISO-8601 timestamp; naive values are taken as UTC.
+
+    Cached: tariff and forecast timestamps repeat across requests until evcc
+    publishes new data.
+    """
+    return parse_evcc_timestamp(s)
+
+
+# (quarter-hour index, local UTC offset); re-resolved when the quarter hour
+# changes so DST switches are picked up without a lookup on every request
+_local_offset_cache: Tuple[int, timedelta] = (-1, timedelta(0))
+
+
+def _local_offset(now: datetime) -> timedelta:
+    """System local UTC offset at the aware datetime `now`."""
+    global _local_offset_cache
+    key = int(now.timestamp()) // 900
+    if _local_offset_cache[0] != key:
+        _local_offset_cache = (key, now.astimezone().utcoffset() or timedelta(0))
+    return _local_offset_cache[1]
+
+
+def _load_static_files() -> Dict[str, Tuple[bytes, str, str]]:
+    """Read all files under STATIC_DIR into memory with a strong ETag each."""
+    files = {}
+    for filepath in STATIC_DIR.rglob("*"):
+        if not filepath.is_file():
+            continue
+        filename = filepath.relative_to(STATIC_DIR).as_posix()
+        body = filepath.read_bytes()
+        mime = "text/css" if filename.endswith(".css") else \
+               "application/javascript" if filename.endswith(".js") else "text/plain"
+        etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        files[filename] = (body, mime, etag)
+    return files
+
 
 class ThreadedHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
     """HTTPServer with per-request daemon threads.
@@ -51,6 +174,481 @@ class ThreadedHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
     do not block regular API requests.
     """
     daemon_threads = True
+    # Owning WebServer, attached by WebServer.start()
+    srv_ref: "WebServer" = None
+
+
+class _SmartloadHandler(BaseHTTPRequestHandler):
+    """Request handler for the API and dashboard.
+
+    Defined once at module level; the owning WebServer is reached through
+    self.server.srv_ref (set by WebServer.start()).
+    """
+
+    # Persistent connections for the dashboard's polling; idle
+    # keep-alive sockets are dropped after `timeout` seconds.
+    protocol_version = "HTTP/1.1"
+    timeout = 60
+
+    def log_message(self, *_): pass
+
+    def _json(self, data, status=200, etag=None):
+        # Compact by default; ?pretty=1 indents for humans reading the API
+        pretty = "?" in self.path and parse_qs(urlparse(self.path).query).get("pretty") == ["1"]
+        buf = _json_dumps(data, pretty=pretty)
+        self._json_bytes(buf, status, etag)
+
+    def _json_bytes(self, buf: bytes, status=200, etag=None):
+        """Send an already serialized JSON body."""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self._send_compressible(buf)
+
+    def _not_modified(self, etag) -> bool:
+        """Answer 304 when the client already holds the response tagged `etag`."""
+        if self.headers.get("If-None-Match") != etag:
+            return False
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        return True
+
+    def _html(self, html, status=200):
+        buf = html if isinstance(html, bytes) else html.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self._send_compressible(buf)
+
+    def _send_compressible(self, buf: bytes):
+        """Finish the headers and send `buf`, compressed if the client accepts it."""
+        buf, encoding = _compress(buf, self.headers.get("Accept-Encoding", ""))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(buf)))
+        self.end_headers()
+        self._write_body(buf)
+
+    def _write_body(self, buf: bytes):
+        """Write a response body; large bodies go out in slices without copying."""
+        if len(buf) < _CHUNKED_WRITE_MIN:
+            self.wfile.write(buf)
+            return
+        mv = memoryview(buf)
+        for i in range(0, len(mv), _WRITE_CHUNK):
+            self.wfile.write(mv[i:i + _WRITE_CHUNK])
+
+    def do_GET(self):
+        srv = self.server.srv_ref
+        path = self.path.split("?")[0]
+
+        # v6.1: Config error guard — serve error page when critical errors exist
+        config_errors = getattr(self.server, "_config_errors", [])
+        if config_errors and any(e.severity == "critical" for e in config_errors):
+            if path in ("/", ""):
+                self._html(srv._render_error_page(), 503)
+                return
+            elif path == "/status":
+                self._json({
+                    "error": "Add-on nicht gestartet - Konfigurationsfehler",
+                    "details": [
+                        {
+                            "field": e.field,
+                            "message": e.message,
+                            "severity": e.severity,
+                        }
+                        for e in config_errors
+                    ],
+                }, 503)
+                return
+            elif path.startswith("/static/"):
+                pass  # Allow static files so error page can load CSS/JS
+            elif path == "/health":
+                pass  # Allow health check always
+            else:
+                self._json({"error": "Add-on nicht gestartet - Konfigurationsfehler"}, 503)
+                return
+
+        route = self.GET_ROUTES.get(path)
+        if route is not None:
+            route(self)
+        elif path.startswith("/docs/"):
+            self._html(srv._docs_page(path))
+        elif path.startswith("/static/"):
+            srv._serve_static(self, path)
+        else:
+            self._json({"error": "not found"}, 404)
+
+    # --- GET routes ---
+
+    def _get_dashboard(self):
+        srv = self.server.srv_ref
+        self._html(srv._dashboard_html)
+
+    def _get_health(self):
+        self._json({"status": "ok", "version": VERSION})
+
+    def _get_status(self):
+        srv = self.server.srv_ref
+        etag = srv._status_etag()
+        if self._not_modified(etag):
+            return
+        self._json(srv._api_status(), etag=etag)
+
+    def _get_slots(self):
+        srv = self.server.srv_ref
+        snap = srv._store.snapshot()
+        tariffs = srv.collector.evcc.get_tariff_grid()
+        self._json(srv._api_slots(tariffs, snap["solar_forecast"]))
+
+    def _get_vehicles(self):
+        srv = self.server.srv_ref
+        self._json(srv._api_vehicles())
+
+    def _get_rl_devices(self):
+        srv = self.server.srv_ref
+        self._json(srv._api_rl_devices())
+
+    def _get_config(self):
+        srv = self.server.srv_ref
+        self._json(srv._api_config())
+
+    def _get_summary(self):
+        srv = self.server.srv_ref
+        self._json(srv._api_summary())
+
+    def _get_comparisons(self):
+        srv = self.server.srv_ref
+        self._json({"recent": srv.comparator.comparisons[-50:],
+                    "summary": srv.comparator.get_status()})
+
+    def _get_strategy(self):
+        srv = self.server.srv_ref
+        self._json(srv._api_strategy())
+
+    def _get_decisions(self):
+        srv = self.server.srv_ref
+        if srv.decision_log:
+            self._json({
+                "entries": srv.decision_log.get_recent(40),
+                "cycle": srv.decision_log.get_last_cycle_summary(),
+            })
+        else:
+            self._json({"entries": [], "cycle": {}})
+
+    def _get_chart_data(self):
+        srv = self.server.srv_ref
+        tariffs = srv.collector.evcc.get_tariff_grid()
+        etag = srv._chart_data_etag(tariffs)
+        if self._not_modified(etag):
+            return
+        snap = srv._store.snapshot()
+        self._json(srv._api_chart_data(tariffs, snap["solar_forecast"]), etag=etag)
+
+    def _get_forecast(self):
+        srv = self.server.srv_ref
+        snap = srv._store.snapshot()
+        forecast_data = {
+            "consumption_96": snap.get("consumption_forecast"),
+            "pv_96": snap.get("pv_forecast"),
+            "pv_confidence": snap.get("pv_confidence", 0.0),
+            "pv_correction_label": snap.get("pv_correction_label", ""),
+            "pv_quality_label": snap.get("pv_quality_label", ""),
+            "forecaster_ready": snap.get("forecaster_ready", False),
+            "forecaster_data_days": snap.get("forecaster_data_days", 0),
+            "ha_warnings": snap.get("ha_warnings", []),
+            "price_zones_96": srv._compute_price_zones(snap),
+        }
+        self._json(forecast_data)
+
+    # v5 endpoints
+    def _get_sequencer(self):
+        srv = self.server.srv_ref
+        if srv.sequencer is None:
+            self._json_bytes(_SEQUENCER_DISABLED_JSON)
+            return
+        self._json(srv._api_sequencer())
+
+    def _get_drivers(self):
+        srv = self.server.srv_ref
+        if srv.driver_mgr is None:
+            self._json_bytes(_DRIVERS_DISABLED_JSON)
+            return
+        self._json(srv._api_drivers())
+
+    # Phase 11: mode control status
+    def _get_mode_control(self):
+        srv = self.server.srv_ref
+        mc = getattr(srv, "mode_controller", None)
+        if mc:
+            self._json(mc.get_status())
+        else:
+            self._json({"active": False, "error": "Mode controller not initialized"})
+
+    # Phase 6: plan timeline endpoint
+    def _get_plan(self):
+        srv = self.server.srv_ref
+        plan = srv._store.get_plan()
+        if plan is None:
+            self._json({"available": False, "slots": []})
+        else:
+            self._json(srv._api_plan(plan))
+
+    # Phase 6: history endpoint (planned vs actual comparison)
+    def _get_history(self):
+        srv = self.server.srv_ref
+        hours = 24
+        if "?" in self.path:
+            qs = parse_qs(urlparse(self.path).query)
+            try:
+                hours = int(qs.get("hours", ["24"])[0])
+                if hours not in (24, 168):
+                    hours = 24
+            except (ValueError, TypeError):
+                hours = 24
+        if srv.plan_snapshotter is None:
+            self._json({"available": False, "rows": [], "reason": "snapshotter not initialized"})
+        else:
+            rows = srv.plan_snapshotter.query_comparison(hours)
+            self._json({"available": bool(rows), "hours": hours, "rows": rows})
+
+    # Phase 7: override status
+    def _get_override_status(self):
+        srv = self.server.srv_ref
+        self._json(srv._api_override_status())
+
+    # Phase 7 Plan 02: departure times for dashboard polling
+    def _get_departure_times(self):
+        srv = self.server.srv_ref
+        self._json(srv._api_departure_times())
+
+    # Phase 8: RL learning status for Lernen tab
+    def _get_rl_learning(self):
+        srv = self.server.srv_ref
+        self._json(srv._api_rl_learning())
+
+    def _get_rl_audit(self):
+        srv = self.server.srv_ref
+        self._json(srv._api_rl_audit())
+
+    def _get_docs(self):
+        srv = self.server.srv_ref
+        self._html(srv._docs_index_html)
+
+    def _sse_stream(self):
+        """SSE endpoint: keeps connection alive, pushes state on each update."""
+        srv = self.server.srv_ref
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        # Unframed stream — the connection ends with the stream
+        # (send_header sets close_connection from this header)
+        self.send_header("Connection", "close")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+
+        client_q = srv._store.register_sse_client()
+        try:
+            while True:
+                try:
+                    data = client_q.get(timeout=30)
+                    payload = json.dumps(data, default=str)
+                    self.wfile.write(f"data: {payload}\n\n".encode())
+                    self.wfile.flush()
+                except queue.Empty:
+                    # Keepalive comment — prevents proxy/browser timeout
+                    self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+        finally:
+            srv._store.unregister_sse_client(client_q)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length)) if length else {}
+
+        route = self.POST_ROUTES.get(self.path)
+        if route is not None:
+            route(self, body)
+        else:
+            self._json({"error": "not found"}, 404)
+
+    # --- POST routes ---
+
+    def _post_manual_soc(self, body):
+        srv = self.server.srv_ref
+        name = body.get("vehicle", "")
+        soc = body.get("soc")
+        if not name or soc is None:
+            self._json({"error": "vehicle and soc required"}, 400)
+            return
+        try:
+            soc = float(soc)
+            if not 0 <= soc <= 100:
+                raise ValueError
+        except (ValueError, TypeError):
+            self._json({"error": "soc must be 0-100"}, 400)
+            return
+        srv.manual_store.set(name, soc)
+        srv.vehicle_monitor.trigger_refresh(name)
+        self._json({"ok": True, "vehicle": name, "soc": soc})
+
+    def _post_rl_override(self, body):
+        srv = self.server.srv_ref
+        device = body.get("device", "")
+        mode = body.get("mode")
+        if not device:
+            self._json({"error": "device required"}, 400)
+            return
+        result = srv.rl_devices.set_override(device, mode)
+        self._json(result)
+
+    def _post_vehicles_refresh(self, body):
+        srv = self.server.srv_ref
+        name = body.get("vehicle", "")
+        if not name:
+            self._json({"error": "vehicle required"}, 400)
+            return
+        now = time.time()
+        last = srv._poll_throttle.get(name, 0)
+        remaining = int(300 - (now - last))
+        if remaining > 0:
+            self._json({"ok": False, "throttled": True, "retry_in_seconds": remaining}, 429)
+            return
+        srv._poll_throttle[name] = now
+        srv.vehicle_monitor.trigger_refresh(name)
+        self._json({"ok": True, "throttled": False})
+
+    # v5: sequencer manual request
+    def _post_sequencer_request(self, body):
+        srv = self.server.srv_ref
+        if srv.sequencer is None:
+            self._json({"error": "sequencer disabled"}, 503)
+            return
+        vehicle = body.get("vehicle", "")
+        target_soc = body.get("target_soc")
+        if not vehicle or target_soc is None:
+            self._json({"error": "vehicle and target_soc required"}, 400)
+            return
+        vehicles = srv.vehicle_monitor.get_all_vehicles()
+        v = vehicles.get(vehicle)
+        if not v:
+            self._json({"error": f"vehicle '{vehicle}' not found"}, 404)
+            return
+        req = srv.sequencer.add_request(
+            vehicle=vehicle,
+            driver=body.get("driver", "manual"),
+            target_soc=int(target_soc),
+            current_soc=v.get_effective_soc(),
+            capacity_kwh=v.capacity_kwh,
+            charge_power_kw=getattr(v, "charge_power_kw", None) or 11.0,
+        )
+        self._json({"ok": True, "request": {
+            "vehicle": req.vehicle_name,
+            "target_soc": req.target_soc,
+            "need_kwh": req.need_kwh,
+            "hours_needed": req.hours_needed,
+        }})
+
+    def _post_sequencer_cancel(self, body):
+        srv = self.server.srv_ref
+        if srv.sequencer is None:
+            self._json({"error": "sequencer disabled"}, 503)
+            return
+        vehicle = body.get("vehicle", "")
+        if not vehicle:
+            self._json({"error": "vehicle required"}, 400)
+            return
+        srv.sequencer.remove_request(vehicle)
+        self._json({"ok": True, "vehicle": vehicle})
+
+    # Phase 5: dynamic buffer manual control
+    def _post_buffer_activate_live(self, body):
+        srv = self.server.srv_ref
+        if srv.buffer_calc is None:
+            self._json({"error": "dynamic buffer disabled"}, 503)
+            return
+        srv.buffer_calc.activate_live()
+        self._json({"ok": True, "mode": "live"})
+
+    def _post_buffer_extend_obs(self, body):
+        srv = self.server.srv_ref
+        if srv.buffer_calc is None:
+            self._json({"error": "dynamic buffer disabled"}, 503)
+            return
+        days = body.get("days", 14)
+        try:
+            days = int(days)
+            if not 1 <= days <= 90:
+                raise ValueError
+        except (ValueError, TypeError):
+            self._json({"error": "days must be 1-90"}, 400)
+            return
+        srv.buffer_calc.extend_observation(extra_days=days)
+        self._json({"ok": True, "mode": "observation", "extended_days": days})
+
+    # Phase 7: Boost Charge override endpoints
+    def _post_override_boost(self, body):
+        srv = self.server.srv_ref
+        self._json(srv._api_override_boost(body))
+
+    def _post_override_cancel(self, body):
+        srv = self.server.srv_ref
+        self._json(srv._api_override_cancel())
+
+    GET_ROUTES = {
+        "/": _get_dashboard,
+        "/health": _get_health,
+        "/status": _get_status,
+        "/slots": _get_slots,
+        "/vehicles": _get_vehicles,
+        "/rl-devices": _get_rl_devices,
+        "/config": _get_config,
+        "/summary": _get_summary,
+        "/comparisons": _get_comparisons,
+        "/strategy": _get_strategy,
+        "/decisions": _get_decisions,
+        "/chart-data": _get_chart_data,
+        "/forecast": _get_forecast,
+        "/sequencer": _get_sequencer,
+        "/drivers": _get_drivers,
+        "/mode-control": _get_mode_control,
+        "/events": _sse_stream,
+        "/plan": _get_plan,
+        "/history": _get_history,
+        "/override/status": _get_override_status,
+        "/departure-times": _get_departure_times,
+        "/rl-learning": _get_rl_learning,
+        "/rl-audit": _get_rl_audit,
+        "/docs": _get_docs,
+    }
+
+    POST_ROUTES = {
+        "/vehicles/manual-soc": _post_manual_soc,
+        "/rl-override": _post_rl_override,
+        "/vehicles/refresh": _post_vehicles_refresh,
+        "/sequencer/request": _post_sequencer_request,
+        "/sequencer/cancel": _post_sequencer_cancel,
+        "/buffer/activate-live": _post_buffer_activate_live,
+        "/buffer/extend-obs": _post_buffer_extend_obs,
+        "/override/boost": _post_override_boost,
+        "/override/cancel": _post_override_cancel,
+    }
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
 
 
 class WebServer:
@@ -98,6 +696,53 @@ class WebServer:
         self.reaction_timing = None
         # Phase 10: per-vehicle poll throttle for POST /vehicles/refresh
         self._poll_throttle: Dict[str, float] = {}
+        # Static assets: relative path → (body, mime, etag), loaded once
+        self._static_cache = _load_static_files()
+        # Rendered pages: static for the process lifetime (depend on VERSION/cfg only)
+        app_js = self._static_cache.get("app.js")
+        self._dashboard_html = render_template("dashboard.html", {
+            "version": VERSION,
+            # Bare digest: the stored ETag is quoted and would break the src attribute
+            "app_js_rev": app_js[2].strip('"') if app_js else VERSION,
+        }).encode()
+        self._docs_index_html = self._docs_index().encode()
+        self._api_docs_html = self._api_docs().encode()
+        # /config fields derived from cfg (fixed once main.py has applied defaults);
+        # the active_* entries are filled in per request from the last LP action
+        self._config_static = {
+            "battery_max_ct": cfg.battery_max_price_ct,
+            "ev_max_ct": cfg.ev_max_price_ct,
+            "active_battery_ct": None,
+            "active_ev_ct": None,
+            "ev_deadline": f"{cfg.ev_charge_deadline_hour}:00",
+            "decision_interval_minutes": cfg.decision_interval_minutes,
+            "battery_charge_eff": cfg.battery_charge_efficiency,
+            "battery_discharge_eff": cfg.battery_discharge_efficiency,
+            "bat_to_ev_min_ct": cfg.battery_to_ev_min_profit_ct,
+            "bat_to_ev_dynamic": cfg.battery_to_ev_dynamic_limit,
+            "bat_to_ev_floor": cfg.battery_to_ev_floor_soc,
+            # v5
+            "quiet_hours_enabled": cfg.quiet_hours_enabled,
+            "quiet_hours_start": cfg.quiet_hours_start,
+            "quiet_hours_end": cfg.quiet_hours_end,
+            "sequencer_enabled": cfg.sequencer_enabled,
+        }
+        # Rendered markdown docs: filename → (mtime, html bytes)
+        self._md_cache: Dict[str, Tuple[float, bytes]] = {}
+        # /chart-data: parsed tariff rows and solar buckets, keyed by input content
+        self._chart_tariffs: Tuple[Optional[tuple], list] = (None, [])
+        self._chart_solar: Tuple[Optional[tuple], dict, dict] = (None, {}, {})
+        # Shared response timestamp (second resolution) for polled endpoints
+        self._now_lock = threading.Lock()
+        self._now_t = 0.0
+        self._now_iso_str = ""
+        # /vehicles payload, pushed by VehicleMonitor after each refresh
+        self._vehicles_snapshot: Optional[dict] = None
+        # Boot nonce for the /status and /chart-data ETags: revisions restart at
+        # zero with the process, so tags from a previous run must never match
+        self._etag_nonce = "%x" % time.time_ns()
+        # Derived state fields for /status and /summary, keyed by snapshot last_update
+        self._state_view_cache: Tuple[Optional[datetime], dict] = (None, {})
 
     # ------------------------------------------------------------------
     # Start
@@ -134,319 +779,13 @@ class WebServer:
         return render_template("error.html", context)
 
     def start(self):
-        srv = self
-
-        class Handler(BaseHTTPRequestHandler):
-            def log_message(self, *_): pass
-
-            def _json(self, data, status=200):
-                self.send_response(status)
-                self.send_header("Content-Type", "application/json")
-                self.send_header("Access-Control-Allow-Origin", "*")
-                self.end_headers()
-                self.wfile.write(json.dumps(data, indent=2, default=str).encode())
-
-            def _html(self, html, status=200):
-                self.send_response(status)
-                self.send_header("Content-Type", "text/html; charset=utf-8")
-                self.end_headers()
-                self.wfile.write(html.encode())
-
-            def do_GET(self):
-                path = self.path.split("?")[0]
-
-                # v6.1: Config error guard — serve error page when critical errors exist
-                config_errors = getattr(self.server, "_config_errors", [])
-                if config_errors and any(e.severity == "critical" for e in config_errors):
-                    if path in ("/", ""):
-                        self._html(srv._render_error_page(), 503)
-                        return
-                    elif path == "/status":
-                        self._json({
-                            "error": "Add-on nicht gestartet - Konfigurationsfehler",
-                            "details": [
-                                {
-                                    "field": e.field,
-                                    "message": e.message,
-                                    "severity": e.severity,
-                                }
-                                for e in config_errors
-                            ],
-                        }, 503)
-                        return
-                    elif path.startswith("/static/"):
-                        pass  # Allow static files so error page can load CSS/JS
-                    elif path == "/health":
-                        pass  # Allow health check always
-                    else:
-                        self._json({"error": "Add-on nicht gestartet - Konfigurationsfehler"}, 503)
-                        return
-
-                if path == "/":
-                    self._html(render_template("dashboard.html", {"version": VERSION}))
-                elif path == "/health":
-                    self._json({"status": "ok", "version": VERSION})
-                elif path == "/status":
-                    self._json(srv._api_status())
-                elif path == "/slots":
-                    snap = srv._store.snapshot()
-                    tariffs = srv.collector.evcc.get_tariff_grid()
-                    self._json(srv._api_slots(tariffs, snap["solar_forecast"]))
-                elif path == "/vehicles":
-                    self._json(srv._api_vehicles())
-                elif path == "/rl-devices":
-                    self._json(srv._api_rl_devices())
-                elif path == "/config":
-                    self._json(srv._api_config())
-                elif path == "/summary":
-                    self._json(srv._api_summary())
-                elif path == "/comparisons":
-                    self._json({"recent": srv.comparator.comparisons[-50:],
-                                "summary": srv.comparator.get_status()})
-                elif path == "/strategy":
-                    self._json(srv._api_strategy())
-                elif path == "/decisions":
-                    if srv.decision_log:
-                        self._json({
-                            "entries": srv.decision_log.get_recent(40),
-                            "cycle": srv.decision_log.get_last_cycle_summary(),
-                        })
-                    else:
-                        self._json({"entries": [], "cycle": {}})
-                elif path == "/chart-data":
-                    snap = srv._store.snapshot()
-                    tariffs = srv.collector.evcc.get_tariff_grid()
-                    self._json(srv._api_chart_data(tariffs, snap["solar_forecast"]))
-                elif path == "/forecast":
-                    snap = srv._store.snapshot()
-                    forecast_data = {
-                        "consumption_96": snap.get("consumption_forecast"),
-                        "pv_96": snap.get("pv_forecast"),
-                        "pv_confidence": snap.get("pv_confidence", 0.0),
-                        "pv_correction_label": snap.get("pv_correction_label", ""),
-                        "pv_quality_label": snap.get("pv_quality_label", ""),
-                        "forecaster_ready": snap.get("forecaster_ready", False),
-                        "forecaster_data_days": snap.get("forecaster_data_days", 0),
-                        "ha_warnings": snap.get("ha_warnings", []),
-                        "price_zones_96": srv._compute_price_zones(snap),
-                    }
-                    self._json(forecast_data)
-                # v5 endpoints
-                elif path == "/sequencer":
-                    self._json(srv._api_sequencer())
-                elif path == "/drivers":
-                    self._json(srv._api_drivers())
-                # Phase 11: mode control status
-                elif path == "/mode-control":
-                    mc = getattr(srv, "mode_controller", None)
-                    if mc:
-                        self._json(mc.get_status())
-                    else:
-                        self._json({"active": False, "error": "Mode controller not initialized"})
-                # v6: SSE endpoint
-                elif path == "/events":
-                    self._sse_stream()
-                # Phase 6: plan timeline endpoint
-                elif path == "/plan":
-                    plan = srv._store.get_plan()
-                    if plan is None:
-                        self._json({"available": False, "slots": []})
-                    else:
-                        self._json(srv._api_plan(plan))
-                # Phase 6: history endpoint (planned vs actual comparison)
-                elif path == "/history":
-                    hours = 24
-                    if "?" in self.path:
-                        qs = parse_qs(urlparse(self.path).query)
-                        try:
-                            hours = int(qs.get("hours", ["24"])[0])
-                            if hours not in (24, 168):
-                                hours = 24
-                        except (ValueError, TypeError):
-                            hours = 24
-                    if srv.plan_snapshotter is None:
-                        self._json({"available": False, "rows": [], "reason": "snapshotter not initialized"})
-                    else:
-                        rows = srv.plan_snapshotter.query_comparison(hours)
-                        self._json({"available": bool(rows), "hours": hours, "rows": rows})
-                # Phase 7: override status
-                elif path == "/override/status":
-                    self._json(srv._api_override_status())
-                # Phase 7 Plan 02: departure times for dashboard polling
-                elif path == "/departure-times":
-                    self._json(srv._api_departure_times())
-                # Phase 8: RL learning status for Lernen tab
-                elif path == "/rl-learning":
-                    self._json(srv._api_rl_learning())
-                elif path == "/rl-audit":
-                    self._json(srv._api_rl_audit())
-                elif path == "/docs":
-                    self._html(srv._docs_index())
-                elif path.startswith("/docs/"):
-                    self._html(srv._docs_page(path))
-                elif path.startswith("/static/"):
-                    srv._serve_static(self, path)
-                else:
-                    self._json({"error": "not found"}, 404)
-
-            def _sse_stream(self):
-                """SSE endpoint: keeps connection alive, pushes state on each update."""
-                self.send_response(200)
-                self.send_header("Content-Type", "text/event-stream")
-                self.send_header("Cache-Control", "no-cache")
-                self.send_header("Connection", "keep-alive")
-                self.send_header("Access-Control-Allow-Origin", "*")
-                self.end_headers()
-
-                client_q = srv._store.register_sse_client()
-                try:
-                    while True:
-                        try:
-                            data = client_q.get(timeout=30)
-                            payload = json.dumps(data, default=str)
-                            self.wfile.write(f"data: {payload}\n\n".encode())
-                            self.wfile.flush()
-                        except queue.Empty:
-                            # Keepalive comment — prevents proxy/browser timeout
-                            self.wfile.write(b": keepalive\n\n")
-                            self.wfile.flush()
-                except (BrokenPipeError, ConnectionResetError, OSError):
-                    pass
-                finally:
-                    srv._store.unregister_sse_client(client_q)
-
-            def do_POST(self):
-                path = self.path
-                length = int(self.headers.get("Content-Length", 0))
-                body = json.loads(self.rfile.read(length)) if length else {}
-
-                if path == "/vehicles/manual-soc":
-                    name = body.get("vehicle", "")
-                    soc = body.get("soc")
-                    if not name or soc is None:
-                        self._json({"error": "vehicle and soc required"}, 400)
-                        return
-                    try:
-                        soc = float(soc)
-                        if not 0 <= soc <= 100:
-                            raise ValueError
-                    except (ValueError, TypeError):
-                        self._json({"error": "soc must be 0-100"}, 400)
-                        return
-                    srv.manual_store.set(name, soc)
-                    srv.vehicle_monitor.trigger_refresh(name)
-                    self._json({"ok": True, "vehicle": name, "soc": soc})
-
-                elif path == "/rl-override":
-                    device = body.get("device", "")
-                    mode = body.get("mode")
-                    if not device:
-                        self._json({"error": "device required"}, 400)
-                        return
-                    result = srv.rl_devices.set_override(device, mode)
-                    self._json(result)
-
-                elif path == "/vehicles/refresh":
-                    name = body.get("vehicle", "")
-                    if not name:
-                        self._json({"error": "vehicle required"}, 400)
-                        return
-                    now = time.time()
-                    last = srv._poll_throttle.get(name, 0)
-                    remaining = int(300 - (now - last))
-                    if remaining > 0:
-                        self._json({"ok": False, "throttled": True, "retry_in_seconds": remaining}, 429)
-                        return
-                    srv._poll_throttle[name] = now
-                    srv.vehicle_monitor.trigger_refresh(name)
-                    self._json({"ok": True, "throttled": False})
-
-                # v5: sequencer manual request
-                elif path == "/sequencer/request":
-                    if srv.sequencer is None:
-                        self._json({"error": "sequencer disabled"}, 503)
-                        return
-                    vehicle = body.get("vehicle", "")
-                    target_soc = body.get("target_soc")
-                    if not vehicle or target_soc is None:
-                        self._json({"error": "vehicle and target_soc required"}, 400)
-                        return
-                    vehicles = srv.vehicle_monitor.get_all_vehicles()
-                    v = vehicles.get(vehicle)
-                    if not v:
-                        self._json({"error": f"vehicle '{vehicle}' not found"}, 404)
-                        return
-                    req = srv.sequencer.add_request(
-                        vehicle=vehicle,
-                        driver=body.get("driver", "manual"),
-                        target_soc=int(target_soc),
-                        current_soc=v.get_effective_soc(),
-                        capacity_kwh=v.capacity_kwh,
-                        charge_power_kw=getattr(v, "charge_power_kw", None) or 11.0,
-                    )
-                    self._json({"ok": True, "request": {
-                        "vehicle": req.vehicle_name,
-                        "target_soc": req.target_soc,
-                        "need_kwh": req.need_kwh,
-                        "hours_needed": req.hours_needed,
-                    }})
-
-                elif path == "/sequencer/cancel":
-                    if srv.sequencer is None:
-                        self._json({"error": "sequencer disabled"}, 503)
-                        return
-                    vehicle = body.get("vehicle", "")
-                    if not vehicle:
-                        self._json({"error": "vehicle required"}, 400)
-                        return
-                    srv.sequencer.remove_request(vehicle)
-                    self._json({"ok": True, "vehicle": vehicle})
-
-                # Phase 5: dynamic buffer manual control
-                elif path == "/buffer/activate-live":
-                    if srv.buffer_calc is None:
-                        self._json({"error": "dynamic buffer disabled"}, 503)
-                        return
-                    srv.buffer_calc.activate_live()
-                    self._json({"ok": True, "mode": "live"})
-
-                elif path == "/buffer/extend-obs":
-                    if srv.buffer_calc is None:
-                        self._json({"error": "dynamic buffer disabled"}, 503)
-                        return
-                    days = body.get("days", 14)
-                    try:
-                        days = int(days)
-                        if not 1 <= days <= 90:
-                            raise ValueError
-                    except (ValueError, TypeError):
-                        self._json({"error": "days must be 1-90"}, 400)
-                        return
-                    srv.buffer_calc.extend_observation(extra_days=days)
-                    self._json({"ok": True, "mode": "observation", "extended_days": days})
-
-                # Phase 7: Boost Charge override endpoints
-                elif path == "/override/boost":
-                    self._json(srv._api_override_boost(body))
-
-                elif path == "/override/cancel":
-                    self._json(srv._api_override_cancel())
-
-                else:
-                    self._json({"error": "not found"}, 404)
-
-            def do_OPTIONS(self):
-                self.send_response(204)
-                self.send_header("Access-Control-Allow-Origin", "*")
-                self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-                self.send_header("Access-Control-Allow-Headers", "Content-Type")
-                self.end_headers()
-
         def _run():
-            server = ThreadedHTTPServer(("0.0.0.0", self.cfg.api_port), Handler)
-            # Attach store reference to server so Handler can access it via self.server._store
+            server = ThreadedHTTPServer(("0.0.0.0", self.cfg.api_port), _SmartloadHandler)
+            # Handlers reach the WebServer (API builders, caches) via self.server.srv_ref
+            server.srv_ref = self
+            # Attach store reference to server so handlers can access it via self.server._store
             server._store = self._store
-            # Attach config errors so Handler can guard routes during error state
+            # Attach config errors so handlers can guard routes during error state
             server._config_errors = self._config_errors
             log("info", f"API server running on port {self.cfg.api_port} (threaded, SSE enabled)")
             server.serve_forever()
@@ -459,33 +798,86 @@ class WebServer:
 
     def _serve_static(self, handler, path: str):
         filename = path.replace("/static/", "", 1)
-        filepath = STATIC_DIR / filename
-        if not filepath.exists() or not filepath.is_file():
+        entry = self._static_cache.get(filename)
+        if entry is None:
             handler._json({"error": "not found"}, 404)
             return
-        mime = "text/css" if filename.endswith(".css") else \
-               "application/javascript" if filename.endswith(".js") else "text/plain"
+        body, mime, etag = entry
+        # Asset URLs carry a content revision (?v=...), so they can be cached forever
+        if handler.headers.get("If-None-Match") == etag:
+            handler.send_response(304)
+            handler.send_header("ETag", etag)
+            handler.send_header("Cache-Control", "public, max-age=31536000, immutable")
+            handler.end_headers()
+            return
         handler.send_response(200)
         handler.send_header("Content-Type", mime)
-        handler.send_header("Cache-Control", "public, max-age=60")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.send_header("ETag", etag)
+        handler.send_header("Cache-Control", "public, max-age=31536000, immutable")
         handler.end_headers()
-        handler.wfile.write(filepath.read_bytes())
+        handler._write_body(body)
 
     # ------------------------------------------------------------------
     # JSON API builders
     # ------------------------------------------------------------------
 
-    def _api_status(self) -> dict:
-        snap = self._store.snapshot()
+    def _now_iso(self) -> str:
+        """Local ISO timestamp for API responses, refreshed at most once per second."""
+        t = time.monotonic()
+        if t - self._now_t >= 1.0:
+            with self._now_lock:
+                if t - self._now_t >= 1.0:
+                    self._now_iso_str = datetime.now().isoformat(timespec="seconds")
+                    self._now_t = t
+        return self._now_iso_str
+
+    def _status_etag(self) -> str:
+        """Weak ETag for /status, derived from every input the response reads.
+
+        - StateStore revision: current state, active limits, config view
+        - RL agent: epsilon, total_steps, memory and Q-table sizes
+        - comparator.get_status(): comparisons, win rate, readiness, costs
+        - whether sequencer / Telegram are wired (set late by main.py)
+
+        cfg, VERSION and the RL action/state sizes are fixed for the process,
+        which the boot nonce covers. The per-second timestamp is deliberately
+        left out.
+        """
+        rl = self.rl
+        key = (
+            rl.epsilon, rl.total_steps, len(rl.memory), len(rl.q_table),
+            tuple(self.comparator.get_status().items()),
+            self.sequencer is not None,
+            self.driver_mgr.telegram_enabled if self.driver_mgr else False,
+        )
+        return 'W/"%s-%d-%x"' % (
+            self._etag_nonce,
+            self._store.revision(),
+            hash(key) & 0xFFFFFFFF,
+        )
+
+    def _chart_data_etag(self, tariffs: List[Dict]) -> str:
+        """Weak ETag for /chart-data: StateStore revision, tariff content and the
+        current UTC hour (which moves the price window and the is_now marker)."""
+        key = tuple((t.get("start"), t.get("value")) for t in tariffs)
+        return 'W/"%s-%d-%d-%x"' % (
+            self._etag_nonce,
+            self._store.revision(),
+            int(time.time() // 3600),
+            hash(key) & 0xFFFFFFFF,
+        )
+
+    def _state_view(self, snap: dict) -> dict:
+        """Rounded/ct-converted state fields; recomputed only after a StateStore update."""
+        key = snap["last_update"]
+        cached_key, view = self._state_view_cache
+        if key is not None and key == cached_key:
+            return view
         state = snap["state"]
         lp = snap["lp_action"]
-        comparison = self.comparator.get_status()
-        maturity = self._rl_maturity(comparison)
         p = state.price_percentiles if state else {}
-        return {
-            "timestamp": datetime.now().isoformat(),
-            "version": VERSION,
-            "rl_maturity": maturity,
+        view = {
             "current": {
                 "battery_soc": state.battery_soc,
                 "battery_w": state.battery_power,
@@ -510,6 +902,21 @@ class WebServer:
                 "battery_action": lp.battery_action if lp else None,
                 "ev_action": lp.ev_action if lp else None,
             },
+        }
+        self._state_view_cache = (key, view)
+        return view
+
+    def _api_status(self) -> dict:
+        snap = self._store.snapshot()
+        view = self._state_view(snap)
+        comparison = self.comparator.get_status()
+        maturity = self._rl_maturity(comparison)
+        return {
+            "timestamp": self._now_iso(),
+            "version": VERSION,
+            "rl_maturity": maturity,
+            "current": view["current"],
+            "active_limits": view["active_limits"],
             "rl": {
                 "enabled": self.cfg.rl_enabled,
                 "epsilon": round(self.rl.epsilon, 4),
@@ -526,45 +933,21 @@ class WebServer:
                 "optimizer_total_eur": round(comparison.get("lp_total_cost", 0), 2),
                 "rl_simulated_eur": round(comparison.get("rl_total_cost", 0), 2),
             },
-            "config": self._api_config(),
+            "config": self._api_config(view),
             # v5
             "sequencer_enabled": self.sequencer is not None,
             "telegram_enabled": self.driver_mgr.telegram_enabled if self.driver_mgr else False,
         }
 
+    def update_vehicles(self, snapshot: dict):
+        """Receive the precomputed /vehicles payload pushed by VehicleMonitor."""
+        self._vehicles_snapshot = snapshot
+
     def _api_vehicles(self) -> dict:
-        vehicles = self.vehicle_monitor.get_all_vehicles()
-        needs = self.vehicle_monitor.predict_charge_need()
-        mgr = self.vehicle_monitor._manager
-        return {
-            "timestamp": datetime.now().isoformat(),
-            "vehicles": {
-                name: {
-                    "soc": v.get_effective_soc(),
-                    "raw_soc": v.soc,
-                    "manual_soc": v.manual_soc,
-                    "capacity_kwh": v.capacity_kwh,
-                    "range_km": v.range_km,
-                    "connected": v.connected_to_wallbox,
-                    "charging": v.charging,
-                    "charge_needed_kwh": needs.get(name, 0),
-                    "data_source": v.data_source,
-                    "last_update": v.last_update.isoformat() if v.last_update else None,
-                    "last_poll": v.last_poll.isoformat() if v.last_poll else None,
-                    "last_successful_poll": v.last_successful_poll.isoformat() if v.last_successful_poll else None,
-                    "freshness": v.freshness,
-                    "poll_age": v.get_poll_age_string(),
-                    "data_age": v.get_data_age_string(),
-                    "is_stale": v.is_data_stale(),
-                }
-                for name, v in vehicles.items()
-                if not mgr.get_vehicle_config(name).get("disabled", False)
-            },
-            "total_charge_needed_kwh": sum(
-                v for n, v in needs.items()
-                if not mgr.get_vehicle_config(n).get("disabled", False)
-            ),
-        }
+        snapshot = self._vehicles_snapshot
+        if snapshot is None:
+            snapshot = self.vehicle_monitor.get_vehicles_snapshot()
+        return {"timestamp": self._now_iso(), **snapshot}
 
     def _api_slots(self, tariffs: List[Dict], solar_forecast: List[Dict] = None) -> dict:
         snap = self._store.snapshot()
@@ -578,7 +961,7 @@ class WebServer:
 
     def _api_rl_devices(self) -> dict:
         return {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._now_iso(),
             "devices": self.rl_devices.get_all_devices(),
             "global_config": {
                 "auto_switch_enabled": self.cfg.rl_auto_switch,
@@ -588,42 +971,29 @@ class WebServer:
             },
         }
 
-    def _api_config(self) -> dict:
-        snap = self._store.snapshot()
-        lp = snap["lp_action"]
-        return {
-            "battery_max_ct": self.cfg.battery_max_price_ct,
-            "ev_max_ct": self.cfg.ev_max_price_ct,
-            # Active dynamic limits (from last optimizer decision)
-            "active_battery_ct": round(lp.battery_limit_eur * 100, 1) if lp and lp.battery_limit_eur else None,
-            "active_ev_ct": round(lp.ev_limit_eur * 100, 1) if lp and lp.ev_limit_eur else None,
-            "ev_deadline": f"{self.cfg.ev_charge_deadline_hour}:00",
-            "decision_interval_minutes": self.cfg.decision_interval_minutes,
-            "battery_charge_eff": self.cfg.battery_charge_efficiency,
-            "battery_discharge_eff": self.cfg.battery_discharge_efficiency,
-            "bat_to_ev_min_ct": self.cfg.battery_to_ev_min_profit_ct,
-            "bat_to_ev_dynamic": self.cfg.battery_to_ev_dynamic_limit,
-            "bat_to_ev_floor": self.cfg.battery_to_ev_floor_soc,
-            # v5
-            "quiet_hours_enabled": self.cfg.quiet_hours_enabled,
-            "quiet_hours_start": self.cfg.quiet_hours_start,
-            "quiet_hours_end": self.cfg.quiet_hours_end,
-            "sequencer_enabled": self.cfg.sequencer_enabled,
-        }
+    def _api_config(self, view: Optional[dict] = None) -> dict:
+        if view is None:
+            view = self._state_view(self._store.snapshot())
+        limits = view["active_limits"]
+        config = dict(self._config_static)
+        # Active dynamic limits (from last optimizer decision)
+        config["active_battery_ct"] = limits["battery_ct"]
+        config["active_ev_ct"] = limits["ev_ct"]
+        return config
 
     def _api_summary(self) -> dict:
         snap = self._store.snapshot()
+        view = self._state_view(snap)
         comp = self.comparator.get_status()
         m = self._rl_maturity(comp)
-        s = snap["state"]
-        lp = snap["lp_action"]
+        current = view["current"]
         return {
             "rl_ready": comp.get("rl_ready", False),
             "rl_maturity_percent": m["percent"],
-            "battery_soc": s.battery_soc if s else None,
-            "ev_soc": s.ev_soc if s else None,
-            "current_price_ct": round(s.current_price * 100, 1) if s else None,
-            "battery_limit_ct": round(lp.battery_limit_eur * 100, 1) if lp and lp.battery_limit_eur else None,
+            "battery_soc": current["battery_soc"] if current else None,
+            "ev_soc": current["ev_soc"] if current else None,
+            "current_price_ct": current["price_ct"] if current else None,
+            "battery_limit_ct": view["active_limits"]["battery_ct"],
         }
 
     def _api_sequencer(self) -> dict:
@@ -633,7 +1003,7 @@ class WebServer:
         now = datetime.now(timezone.utc)
         return {
             "enabled": True,
-            "timestamp": now.isoformat(),
+            "timestamp": now,
             "requests": self.sequencer.get_requests_summary(),
             "schedule": self.sequencer.get_schedule_summary(),
             "quiet_hours": self.sequencer.get_quiet_hours_status(now),
@@ -779,7 +1149,7 @@ class WebServer:
             explanation = self.explanation_gen.explain(slot, plan)
             slots.append({
                 "t": slot.slot_index,
-                "start_iso": slot.slot_start.isoformat(),
+                "start_iso": slot.slot_start,
                 "bat_charge_kw": round(slot.bat_charge_kw, 2),
                 "bat_discharge_kw": round(slot.bat_discharge_kw, 2),
                 "ev_charge_kw": round(slot.ev_charge_kw, 2),
@@ -793,7 +1163,7 @@ class WebServer:
             })
         return {
             "available": True,
-            "computed_at": plan.computed_at.isoformat(),
+            "computed_at": plan.computed_at,
             "total_cost_eur": round(plan.solver_fun, 3),
             "slots": slots,
         }
@@ -830,7 +1200,7 @@ class WebServer:
         # Include connected vehicle if available
         if state is not None and state.ev_connected and state.ev_name:
             dep = self.departure_store.get(state.ev_name)
-            vehicles[state.ev_name] = dep.isoformat() if dep else None
+            vehicles[state.ev_name] = dep
         return {"available": True, "departure_times": vehicles}
 
     def _api_rl_learning(self) -> dict:
@@ -900,51 +1270,17 @@ class WebServer:
         lp = snap["lp_action"]
 
         now = datetime.now(timezone.utc)
-        prices = []
-        for t in tariffs:
-            try:
-                s = t.get("start", "")
-                val = float(t.get("value", 0)) * 100
-                if s.endswith("Z"):
-                    start = datetime.fromisoformat(s.replace("Z", "+00:00"))
-                elif "+" in s:
-                    start = datetime.fromisoformat(s)
-                else:
-                    start = datetime.fromisoformat(s).replace(tzinfo=timezone.utc)
-                hour = start.replace(minute=0, second=0, microsecond=0)
-                if now - timedelta(hours=6) <= hour <= now + timedelta(hours=36):
-                    prices.append({
-                        "hour": hour.astimezone().strftime("%H:%M"),
-                        "hour_utc": hour.isoformat(),
-                        "price_ct": round(val, 2),
-                        "is_now": hour <= now < hour + timedelta(hours=1),
-                    })
-            except Exception:
-                continue
-
-        solar_by_hour = {}
-        if solar_forecast:
-            raw_vals = [float(t.get("value", 0)) for t in solar_forecast
-                        if float(t.get("value", 0)) > 0]
-            unit_factor = 0.001 if raw_vals and sorted(raw_vals)[len(raw_vals) // 2] > 100 else 1.0
-            for t in solar_forecast:
-                try:
-                    s = t.get("start", "")
-                    val = float(t.get("value", 0)) * unit_factor
-                    if s.endswith("Z"):
-                        start = datetime.fromisoformat(s.replace("Z", "+00:00"))
-                    elif "+" in s:
-                        start = datetime.fromisoformat(s)
-                    else:
-                        start = datetime.fromisoformat(s).replace(tzinfo=timezone.utc)
-                    hour = start.replace(minute=0, second=0, microsecond=0)
-                    hour_key = hour.astimezone().strftime("%H:%M")
-                    solar_by_hour[hour_key] = max(solar_by_hour.get(hour_key, 0), val)
-                except Exception:
-                    continue
+        window_start = now - timedelta(hours=6)
+        window_end = now + timedelta(hours=36)
+        prices = [
+            {**row, "is_now": hour <= now < hour + timedelta(hours=1)}
+            for hour, row in self._chart_tariff_rows(tariffs)
+            if window_start <= hour <= window_end
+        ]
+        solar_by_hour, solar_kw = self._chart_solar_by_hour(solar_forecast)
 
         for p in prices:
-            p["solar_kw"] = round(solar_by_hour.get(p["hour"], 0), 2)
+            p["solar_kw"] = solar_kw.get(p["hour"], 0)
 
         # v5: add percentile lines to chart data
         p20_ct = state.price_percentiles.get(20, 0) * 100 if state else 0
@@ -980,6 +1316,72 @@ class WebServer:
             "active_ev_ct": active_ev_ct,
         }
 
+    def _chart_tariff_rows(self, tariffs: List[Dict]) -> list:
+        """Parse tariffs into (hour, row) pairs; reused until the tariff data changes."""
+        key = tuple((t.get("start"), t.get("value")) for t in tariffs)
+        cached_key, rows = self._chart_tariffs
+        if key == cached_key:
+            return rows
+        hours, values = [], []
+        for t in tariffs:
+            try:
+                val = float(t.get("value", 0))
+                hour = _parse_iso(t.get("start", "")).replace(minute=0, second=0, microsecond=0)
+            except Exception:
+                continue
+            hours.append(hour)
+            values.append(val)
+        cents = np.round(np.array(values, dtype=np.float64) * 100.0, 2).tolist()
+        rows = [
+            (hour, {
+                "hour": hour.astimezone().strftime("%H:%M"),
+                "hour_utc": hour.isoformat(),
+                "price_ct": ct,
+            })
+            for hour, ct in zip(hours, cents)
+        ]
+        self._chart_tariffs = (key, rows)
+        return rows
+
+    def _chart_solar_by_hour(self, solar_forecast: Optional[List[Dict]]) -> Tuple[dict, dict]:
+        """Bucket solar forecast by local hour (max kW); reused until the forecast changes.
+
+        Returns the raw hourly maxima and the same values rounded to 0.01 kW.
+        """
+        if not solar_forecast:
+            return {}, {}
+        key = tuple((t.get("start"), t.get("value")) for t in solar_forecast)
+        cached_key, solar_by_hour, solar_kw = self._chart_solar
+        if key == cached_key:
+            return solar_by_hour, solar_kw
+        entries = []
+        for start_str, value in key:
+            try:
+                entries.append((start_str or "", float(0 if value is None else value)))
+            except (TypeError, ValueError):
+                continue
+        pos_vals = [v for _, v in entries if v > 0]
+        # Values in W instead of kW when the median positive value exceeds 100
+        unit_factor = 0.001 if pos_vals and statistics.median_high(pos_vals) > 100 else 1.0
+        buckets: Dict[str, float] = defaultdict(float)
+        for start_str, value in entries:
+            try:
+                val = value * unit_factor
+                hour = _parse_iso(start_str).replace(minute=0, second=0, microsecond=0)
+                hour_key = hour.astimezone().strftime("%H:%M")
+                if val > buckets[hour_key]:
+                    buckets[hour_key] = val
+            except Exception:
+                continue
+        # Plain dict for the cache so later .get() lookups can never insert keys
+        solar_by_hour = dict(buckets)
+        solar_kw = dict(zip(
+            solar_by_hour,
+            np.round(np.fromiter(solar_by_hour.values(), dtype=np.float64, count=len(solar_by_hour)), 2).tolist(),
+        ))
+        self._chart_solar = (key, solar_by_hour, solar_kw)
+        return solar_by_hour, solar_kw
+
     # ------------------------------------------------------------------
     # Documentation
     # ------------------------------------------------------------------
@@ -998,34 +1400,45 @@ class WebServer:
 <p style="text-align:center;margin-top:30px;"><a href="/">← Dashboard</a></p>
 </div></body></html>"""
 
-    def _docs_page(self, path: str) -> str:
+    def _docs_page(self, path: str) -> bytes:
         if path == "/docs/api":
-            return self._api_docs()
+            return self._api_docs_html
         name = path.replace("/docs/", "")
         filemap = {"readme": "README.md", "changelog": "CHANGELOG.md"}
         return self._render_md(filemap.get(name, "README.md"))
 
-    def _render_md(self, filename: str) -> str:
+    def _render_md(self, filename: str) -> bytes:
+        mtime = None
         try:
             for p in [Path("/app") / filename, Path(__file__).parent.parent.parent / filename]:
                 if p.exists():
+                    mtime = p.stat().st_mtime
+                    cached = self._md_cache.get(filename)
+                    if cached is not None and cached[0] == mtime:
+                        return cached[1]
                     content = p.read_text(encoding="utf-8")
                     break
             else:
+                # The not-found page is cached like a document (mtime -1) until the file appears
+                mtime = -1.0
+                cached = self._md_cache.get(filename)
+                if cached is not None and cached[0] == mtime:
+                    return cached[1]
                 content = f"# Fehler\nDokument nicht gefunden: {filename}"
         except Exception as e:
+            mtime = None
             content = f"# Fehler\n{e}"
         h = content.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        h = re.sub(r"^# (.+)$", r"<h1>\1</h1>", h, flags=re.M)
-        h = re.sub(r"^## (.+)$", r"<h2>\1</h2>", h, flags=re.M)
-        h = re.sub(r"^### (.+)$", r"<h3>\1</h3>", h, flags=re.M)
-        h = re.sub(r"```(\w+)?\n(.*?)\n```", r"<pre><code>\2</code></pre>", h, flags=re.S)
-        h = re.sub(r"`([^`]+)`", r"<code>\1</code>", h)
-        h = re.sub(r"\[([^\]]+)\]\(([^\)]+)\)", r'<a href="\2">\1</a>', h)
-        h = re.sub(r"\*\*([^\*]+)\*\*", r"<strong>\1</strong>", h)
-        h = re.sub(r"\*([^\*]+)\*", r"<em>\1</em>", h)
+        h = _RE_H1.sub(r"<h1>\1</h1>", h)
+        h = _RE_H2.sub(r"<h2>\1</h2>", h)
+        h = _RE_H3.sub(r"<h3>\1</h3>", h)
+        h = _RE_FENCE.sub(r"<pre><code>\2</code></pre>", h)
+        h = _RE_CODE.sub(r"<code>\1</code>", h)
+        h = _RE_LINK.sub(r'<a href="\2">\1</a>', h)
+        h = _RE_BOLD.sub(r"<strong>\1</strong>", h)
+        h = _RE_ITALIC.sub(r"<em>\1</em>", h)
         h = "<p>" + h.replace("\n\n", "</p><p>") + "</p>"
-        return f"""<!DOCTYPE html><html><head><title>{filename}</title><meta charset="utf-8">
+        html = f"""<!DOCTYPE html><html><head><title>{filename}</title><meta charset="utf-8">
 <style>body{{font-family:-apple-system,sans-serif;margin:20px;background:#1a1a2e;color:#eee;line-height:1.6;}}
 .c{{max-width:900px;margin:0 auto;}}h1{{color:#00d4ff;border-bottom:2px solid #00d4ff;padding-bottom:10px;}}
 h2{{color:#00ff88;margin-top:30px;}}h3{{color:#ffaa00;}}
@@ -1033,7 +1446,10 @@ code{{background:#0f3460;padding:2px 6px;border-radius:3px;color:#00ff88;}}
 pre{{background:#0f3460;padding:15px;border-radius:8px;overflow-x:auto;}}pre code{{background:none;padding:0;}}
 a{{color:#00d4ff;}}</style></head><body><div class="c">{h}
 <p style="text-align:center;margin-top:30px;"><a href="/docs">← Dokumentation</a> | <a href="/">Dashboard</a></p>
-</div></body></html>"""
+</div></body></html>""".encode()
+        if mtime is not None:
+            self._md_cache[filename] = (mtime, html)
+        return html
 
     def _api_docs(self) -> str:
         return f"""<!DOCTYPE html><html><head><title>API – EVCC-Smartload</title><meta charset="utf-8">
@@ -1047,6 +1463,7 @@ pre{{background:#0f3460;padding:15px;border-radius:6px;}}code{{color:#00ff88;}}
 </style></head><body><div class="c">
 <h1>🔌 EVCC-Smartload API v{VERSION}</h1>
 <p>Basis-URL: <code>http://homeassistant:{self.cfg.api_port}</code></p>
+<p>JSON-Antworten sind kompakt; mit <code>?pretty=1</code> werden sie eingerückt ausgegeben.</p>
 <div class="ep"><span class="m get">GET</span> <span class="path">/status</span><p>Vollständiger System-Status inkl. RL, Percentile, Sequencer-Status</p></div>
 <div class="ep"><span class="m get">GET</span> <span class="path">/events</span><p>v6: SSE-Stream — Live-Updates via Server-Sent Events (kein Polling)</p></div>
 <div class="ep"><span class="m get">GET</span> <span class="path">/vehicles</span><p>Alle Fahrzeuge mit SoC, Quelle, manuelle Overrides</p></div>
@@ -1068,30 +1485,107 @@ pre{{background:#0f3460;padding:15px;border-radius:6px;}}code{{color:#00ff88;}}
 
 
 # =============================================================================
-# Charge-slot calculation (stateless helper — unchanged from v4)
+# Charge-slot calculation (stateless helpers)
 # =============================================================================
 
-def _calculate_charge_slots(tariffs, cfg, last_state, vehicles, solar_forecast=None) -> dict:
-    now = datetime.now(timezone.utc)
-    buckets: Dict[datetime, List[float]] = defaultdict(list)
-    for t in tariffs:
+_series_cache: Dict[tuple, Tuple[np.ndarray, list, np.ndarray]] = {}
+
+
+def _parse_series(series: tuple) -> Tuple[np.ndarray, list, np.ndarray]:
+    """Parse (start, value) pairs into hour floors (epoch s), tzinfos and values.
+
+    Hours are floored in each timestamp's own UTC offset. Entries with an
+    unparsable start or value are dropped. Results are cached by content.
+    """
+    cached = _series_cache.get(series)
+    if cached is not None:
+        return cached
+    epochs, offsets, tzinfos, values = [], [], [], []
+    for start_str, value in series:
         try:
-            s = t.get("start", "")
-            val = float(t.get("value", 0))
-            if s.endswith("Z"):
-                start = datetime.fromisoformat(s.replace("Z", "+00:00"))
-            elif "+" in s:
-                start = datetime.fromisoformat(s)
-            else:
-                start = datetime.fromisoformat(s).replace(tzinfo=timezone.utc)
-            hour = start.replace(minute=0, second=0, microsecond=0)
-            if hour >= now - timedelta(hours=1):
-                buckets[hour].append(val)
-        except Exception:
+            start = _parse_iso(start_str)
+            val = float(value)
+        except (AttributeError, TypeError, ValueError):
             continue
-    hourly = sorted([(h, sum(v)/len(v)) for h, v in buckets.items()])
+        epochs.append(int(start.timestamp()))
+        offsets.append(int(start.utcoffset().total_seconds()))
+        tzinfos.append(start.tzinfo)
+        values.append(val)
+    offs = np.array(offsets, dtype=np.int64)
+    floors = (np.array(epochs, dtype=np.int64) + offs) // 3600 * 3600 - offs
+    parsed = (floors, tzinfos, np.array(values, dtype=np.float64))
+    if len(_series_cache) >= _SERIES_CACHE_MAX:
+        _series_cache.clear()
+    _series_cache[series] = parsed
+    return parsed
+
+
+def _bucket_hourly(series: tuple, since: datetime, reduce: str = "mean") -> List[Tuple[datetime, float]]:
+    """Aggregate (start, value) pairs per hour, keeping hours that start at or after `since`.
+
+    Hours are returned sorted as aware datetimes in their timestamp's own
+    offset; values are averaged ("mean") or maxed ("max").
+    """
+    floors, tzinfos, values = _parse_series(series)
+    keep = np.flatnonzero(floors >= since.timestamp())
+    if keep.size == 0:
+        return []
+    # Hour order, entries of the same hour keep their input order (stable sort)
+    keep = keep[np.argsort(floors[keep], kind="stable")]
+    hours, first, inv = np.unique(floors[keep], return_index=True, return_inverse=True)
+    vals = values[keep]
+    if reduce == "max":
+        # Each hour is one contiguous run starting at `first`
+        agg = np.maximum.reduceat(vals, first)
+    else:
+        agg = np.bincount(inv, weights=vals) / np.bincount(inv)
+    return [
+        (datetime.fromtimestamp(h, tzinfos[keep[i]]), v)
+        for h, i, v in zip(hours.tolist(), first.tolist(), agg.tolist())
+    ]
+
+
+# Last (inputs key, result) of _calculate_charge_slots
+_slots_memo: Tuple[Optional[tuple], Optional[dict]] = (None, None)
+
+
+def _calculate_charge_slots(tariffs, cfg, last_state, vehicles, solar_forecast=None) -> dict:
+    """Charge slots for battery and vehicles; reused within the same minute for unchanged inputs.
+
+    cfg is fixed at runtime and not part of the key. Age strings and staleness
+    flags may therefore lag by up to a minute.
+    """
+    global _slots_memo
+    now = datetime.now(timezone.utc)
+    tariff_series = tuple((t.get("start", ""), t.get("value", 0)) for t in tariffs)
+    key = (
+        now.replace(second=0, microsecond=0),
+        tariff_series,
+        tuple((t.get("start"), t.get("value")) for t in solar_forecast) if solar_forecast else None,
+        (last_state.battery_soc, last_state.pv_power, last_state.home_power,
+         last_state.current_price) if last_state else None,
+        tuple(
+            (name, v.get_effective_soc(), v.capacity_kwh, v.connected_to_wallbox, v.charging,
+             v.data_source, v.last_update, v.last_poll, v.manual_soc)
+            for name, v in vehicles.items()
+        ),
+    )
+    memo_key, memo_result = _slots_memo
+    if key == memo_key:
+        return {**memo_result, "timestamp": now}
+    result = _compute_charge_slots(now, tariff_series, cfg, last_state, vehicles, solar_forecast)
+    _slots_memo = (key, result)
+    return result
+
+
+def _compute_charge_slots(now, tariff_series, cfg, last_state, vehicles, solar_forecast) -> dict:
+    hourly = _bucket_hourly(tariff_series, since=now - timedelta(hours=1))
     if not hourly:
         return {"error": "Keine Preisdaten verfügbar"}
+    # Hour starts (epoch s) and prices as arrays for the slot filters and statistics
+    hour_ts = np.fromiter((h.timestamp() for h, _ in hourly), dtype=np.float64, count=len(hourly))
+    prices_eur = np.fromiter((p for _, p in hourly), dtype=np.float64, count=len(hourly))
+    prices_ct = prices_eur * 100.0
 
     deadline_hour = cfg.ev_charge_deadline_hour
     if now.hour < deadline_hour:
@@ -1107,33 +1601,19 @@ def _calculate_charge_slots(tariffs, cfg, last_state, vehicles, solar_forecast=N
     if solar_forecast:
         raw_vals = [float(t.get("value", 0)) for t in solar_forecast if float(t.get("value", 0)) > 0]
         unit_factor = 0.001 if raw_vals and sorted(raw_vals)[len(raw_vals) // 2] > 100 else 1.0
-        parsed_entries = []
-        for t in solar_forecast:
-            try:
-                s = t.get("start", "")
-                val = float(t.get("value", 0))
-                if val <= 0:
-                    continue
-                if s.endswith("Z"):
-                    start = datetime.fromisoformat(s.replace("Z", "+00:00"))
-                elif "+" in s:
-                    start = datetime.fromisoformat(s)
-                else:
-                    start = datetime.fromisoformat(s).replace(tzinfo=timezone.utc)
-                hour = start.replace(minute=0, second=0, microsecond=0)
-                if hour >= now:
-                    parsed_entries.append((hour, val * unit_factor))
-            except Exception:
-                continue
-        for hour, val_kw in parsed_entries:
-            solar_hourly_kw[hour] = max(solar_hourly_kw.get(hour, 0), val_kw)
+        solar_hourly_kw = dict(_bucket_hourly(
+            tuple((t.get("start", ""), float(t.get("value", 0)) * unit_factor)
+                  for t in solar_forecast if float(t.get("value", 0)) > 0),
+            since=now,
+            reduce="max",
+        ))
 
     if solar_hourly_kw:
         pv_energy_forecast_kwh = min(50.0, sum(max(0, kw - home_now_kw) for kw in solar_hourly_kw.values()))
         forecast_source = "evcc"
     else:
         pv_surplus_kw = max(0, pv_now_kw - home_now_kw)
-        local_hour = now.astimezone().hour if now.tzinfo else now.hour
+        local_hour = (now + _local_offset(now)).hour  # now is UTC
         pv_hours_remaining = max(0, 19 - max(local_hour, 7))
         pv_energy_forecast_kwh = pv_surplus_kw * 0.6 * pv_hours_remaining if pv_now_kw > 0.5 else 0
         forecast_source = "estimate"
@@ -1141,8 +1621,8 @@ def _calculate_charge_slots(tariffs, cfg, last_state, vehicles, solar_forecast=N
     pv_surplus_now_kw = max(0, pv_now_kw - home_now_kw)
 
     result = {
-        "timestamp": now.isoformat(),
-        "deadline": ev_deadline.strftime("%H:%M"),
+        "timestamp": now,
+        "deadline": f"{ev_deadline.hour:02d}:00",
         "hours_until_deadline": round((ev_deadline - now).total_seconds() / 3600, 1),
         "energy_balance": {
             "pv_now_kw": round(pv_now_kw, 2),
@@ -1157,49 +1637,61 @@ def _calculate_charge_slots(tariffs, cfg, last_state, vehicles, solar_forecast=N
             cfg.battery_max_soc, cfg.battery_charge_power_kw,
             cfg.battery_max_price_ct, hourly, None, "🔋",
             pv_offset_kwh=min(pv_energy_forecast_kwh * 0.3, 5),
+            hour_ts=hour_ts, prices=prices_eur,
         ),
         "vehicles": {},
     }
 
+    # Effective SoC per vehicle, evaluated once for this request
+    v_items = list(vehicles.items())
+    socs = [v.get_effective_soc() for _, v in v_items]
+    needs = [soc < cfg.ev_target_soc for soc in socs]
+
     pv_for_vehicles = max(0, pv_energy_forecast_kwh * 0.7)
-    n_charging = sum(1 for v in vehicles.values() if v.get_effective_soc() < cfg.ev_target_soc)
+    n_charging = sum(needs)
     pv_per_vehicle = min(pv_for_vehicles / max(1, n_charging), 100)
 
-    for name, v in vehicles.items():
-        needs_charge = v.get_effective_soc() < cfg.ev_target_soc
-        result["vehicles"][name] = _device_slots(
-            name, v.capacity_kwh, v.get_effective_soc(), cfg.ev_target_soc,
-            11, cfg.ev_max_price_ct, hourly, ev_deadline,
-            "🔌" if v.connected_to_wallbox else "🚗",
-            v.last_update.isoformat() if v.last_update else None,
-            pv_offset_kwh=pv_per_vehicle if needs_charge else 0,
-        )
-        result["vehicles"][name]["last_poll"] = v.last_poll.isoformat() if v.last_poll else None
-        result["vehicles"][name]["poll_age"] = v.get_poll_age_string()
-        result["vehicles"][name]["data_age"] = v.get_data_age_string()
-        result["vehicles"][name]["is_stale"] = v.is_data_stale() and not v.connected_to_wallbox
-        result["vehicles"][name]["data_source"] = v.data_source
-        result["vehicles"][name]["connected"] = v.connected_to_wallbox
-        result["vehicles"][name]["charging"] = v.charging
+    # EV energy need for the battery-to-EV block, summed in the same pass
+    total_ev_need = 0
+    for (name, v), soc, needs_charge in zip(v_items, socs, needs):
+        icon = "🔌" if v.connected_to_wallbox else "🚗"
+        if needs_charge:
+            entry = _device_slots(
+                name, v.capacity_kwh, soc, cfg.ev_target_soc,
+                11, cfg.ev_max_price_ct, hourly, ev_deadline, icon,
+                v.last_update,
+                pv_offset_kwh=pv_per_vehicle,
+                hour_ts=hour_ts, prices=prices_eur,
+            )
+        else:
+            # At or above target: what _device_slots returns for zero need
+            entry = {"name": name, "icon": icon, "current_soc": soc, "target_soc": cfg.ev_target_soc,
+                     "capacity_kwh": v.capacity_kwh, "need_kwh": 0, "gross_need_kwh": 0,
+                     "pv_offset_kwh": 0, "hours_needed": 0, "last_update": v.last_update,
+                     "status": "✅ Vollständig geladen", "slots": [],
+                     "total_cost_eur": 0, "avg_price_ct": 0}
+        result["vehicles"][name] = entry
+        entry["last_poll"] = v.last_poll
+        entry["poll_age"] = v.get_poll_age_string()
+        entry["data_age"] = v.get_data_age_string()
+        entry["is_stale"] = v.is_data_stale() and not v.connected_to_wallbox
+        entry["data_source"] = v.data_source
+        entry["connected"] = v.connected_to_wallbox
+        entry["charging"] = v.charging
+        if soc > 0 or v.connected_to_wallbox or v.data_source == "direct_api":
+            total_ev_need += max(0, (cfg.ev_target_soc - soc) / 100 * v.capacity_kwh)
 
     # Battery-to-EV
-    total_ev_need = sum(
-        max(0, (cfg.ev_target_soc - v.get_effective_soc()) / 100 * v.capacity_kwh)
-        for v in vehicles.values()
-        if v.get_effective_soc() > 0 or v.connected_to_wallbox or v.data_source == "direct_api"
-    )
     bat_available_kwh = max(0, (bat_soc - cfg.battery_min_soc) / 100 * cfg.battery_capacity_kwh)
     round_trip_eff = cfg.battery_charge_efficiency * cfg.battery_discharge_efficiency
-    if hourly:
-        all_prices_ct = sorted([p * 100 for _, p in hourly])
-        cheap_n = max(1, len(all_prices_ct) // 3)
-        avg_charge_price_ct = sum(all_prices_ct[:cheap_n]) / cheap_n
+    if prices_ct.size:
+        cheap_n = max(1, prices_ct.size // 3)
+        avg_charge_price_ct = float(np.partition(prices_ct, cheap_n - 1)[:cheap_n].mean())
     else:
         avg_charge_price_ct = cfg.battery_max_price_ct
     bat_to_ev_cost_ct = avg_charge_price_ct / round_trip_eff
     current_price_ct = (last_state.current_price * 100) if last_state else 30.0
-    upcoming_prices = [p * 100 for _, p in hourly[:6]] if hourly else [current_price_ct]
-    avg_upcoming_ct = sum(upcoming_prices) / len(upcoming_prices) if upcoming_prices else current_price_ct
+    avg_upcoming_ct = float(prices_ct[:6].mean()) if prices_ct.size else current_price_ct
     savings_vs_grid_ct = current_price_ct - bat_to_ev_cost_ct
     is_profitable = savings_vs_grid_ct >= cfg.battery_to_ev_min_profit_ct
     bat_for_ev_kwh = min(bat_available_kwh, total_ev_need) if is_profitable else 0
@@ -1232,7 +1724,7 @@ def _calculate_charge_slots(tariffs, cfg, last_state, vehicles, solar_forecast=N
         home_kw = (last_state.home_power / 1000) if last_state and last_state.home_power else 1.0
         solar_surplus_kwh = calc_solar_surplus_kwh(solar_forecast, home_kw)
         solar_refill_pct = min(90, (solar_surplus_kwh / bat_cap) * 100) if bat_cap > 0 else 0
-        cheap_hours = sum(1 for _, p in hourly if p * 100 <= cfg.battery_max_price_ct)
+        cheap_hours = int((prices_ct <= cfg.battery_max_price_ct).sum())
         grid_refill_kwh = cheap_hours * cfg.battery_charge_power_kw * cfg.battery_charge_efficiency
         grid_refill_pct = min(90, (grid_refill_kwh / bat_cap) * 100) if bat_cap > 0 else 0
         total_refill_pct = min(80, solar_refill_pct + grid_refill_pct)
@@ -1256,7 +1748,13 @@ def _calculate_charge_slots(tariffs, cfg, last_state, vehicles, solar_forecast=N
 
 
 def _device_slots(name, capacity, soc, target, power_kw, max_price_ct,
-                  hourly, deadline, icon, last_update=None, pv_offset_kwh=0) -> dict:
+                  hourly, deadline, icon, last_update=None, pv_offset_kwh=0,
+                  hour_ts=None, prices=None) -> dict:
+    """Pick the cheapest hours before `deadline` (next 24 h without one) under max_price_ct.
+
+    `hourly` is sorted by hour. `hour_ts` / `prices` are the same data as
+    arrays (epoch s, EUR/kWh); built here when the caller does not pass them.
+    """
     gross_need = max(0, (target - soc) / 100 * capacity)
     net_need = max(0, gross_need - pv_offset_kwh)
     hours_needed = int(net_need / power_kw * 1.2) + 1 if net_need > 1 else 0
@@ -1267,26 +1765,46 @@ def _device_slots(name, capacity, soc, target, power_kw, max_price_ct,
     if hours_needed == 0:
         return {**base, "status": "✅ Vollständig geladen", "slots": [],
                 "total_cost_eur": 0, "avg_price_ct": 0}
-    if deadline:
-        eligible = [(h, p) for h, p in hourly if h < deadline and p <= max_price_ct / 100]
-    else:
-        eligible = [(h, p) for h, p in hourly[:24] if p <= max_price_ct / 100]
-    if not eligible:
+    if prices is None:
+        hour_ts = np.fromiter((h.timestamp() for h, _ in hourly), dtype=np.float64, count=len(hourly))
+        prices = np.fromiter((p for _, p in hourly), dtype=np.float64, count=len(hourly))
+    # Hours are sorted, so the deadline is a prefix cutoff (binary search)
+    end = int(np.searchsorted(hour_ts, deadline.timestamp())) if deadline else 24
+    eligible_idx = np.flatnonzero(prices[:end] <= max_price_ct / 100)
+    if eligible_idx.size == 0:
         return {**base, "status": f"⚠️ Keine Stunden unter {max_price_ct}ct", "slots": [],
                 "total_cost_eur": 0, "avg_price_ct": 0}
-    chosen = sorted(sorted(eligible, key=lambda x: x[1])[:hours_needed], key=lambda x: x[0])
-    kwh_per = min(net_need, hours_needed * power_kw) / len(chosen) if chosen else 0
-    total_cost = sum(kwh_per * p for _, p in chosen)
-    avg_price = sum(p for _, p in chosen) / len(chosen) * 100
+    eligible_prices = prices[eligible_idx]
+    energy_kwh = min(net_need, hours_needed * power_kw)
+    if pick_slots is not None:
+        # numba-compiled selection and totals (web/slot_kernel.py). Opt-in only:
+        # the add-on image does not install numba, so production takes the else path.
+        idx, kwh_per, total_cost, avg_price, threshold_ct = pick_slots(
+            eligible_prices, hours_needed, energy_kwh)
+    else:
+        # Stable sort keeps hour order among equal prices
+        idx = np.sort(np.argsort(eligible_prices, kind="stable")[:hours_needed])
+        picked = eligible_prices[idx].tolist()
+        kwh_per = energy_kwh / len(picked)
+        total_cost = sum(kwh_per * p for p in picked)
+        avg_price = sum(picked) / len(picked) * 100
+        threshold_ct = max(picked) * 100.0
+    chosen_idx = eligible_idx[idx]
+    chosen = [hourly[i] for i in chosen_idx.tolist()]
+    # ct prices of the chosen hours in one multiply instead of per slot
+    chosen_ct = (prices[chosen_idx] * 100.0).tolist()
     now = datetime.now(timezone.utc)
+    now_hour, now_date = now.hour, now.date()
+    # Bucketed hours are whole hours in the tariff's offset, so HH:00 is exact.
+    # Slot figures stay unrounded; the dashboard formats them with toFixed().
     slots = [{
-        "hour": h.strftime("%H:%M"), "hour_end": (h + timedelta(hours=1)).strftime("%H:%M"),
-        "price_ct": round(p * 100, 1), "power_kw": power_kw,
-        "energy_kwh": round(kwh_per, 1), "cost_eur": round(kwh_per * p, 2),
-        "is_now": h.hour == now.hour and h.date() == now.date(),
-    } for h, p in chosen]
+        "hour": f"{h.hour:02d}:00", "hour_end": f"{(h.hour + 1) % 24:02d}:00",
+        "price_ct": ct, "power_kw": power_kw,
+        "energy_kwh": kwh_per, "cost_eur": kwh_per * p,
+        "is_now": h.hour == now_hour and h.date() == now_date,
+    } for (h, p), ct in zip(chosen, chosen_ct)]
     pv_text = f" (inkl. ~{pv_offset_kwh:.0f}kWh PV)" if pv_offset_kwh > 0.5 else ""
     status = f"✅ {len(chosen)} Stunden geplant{pv_text}" if len(chosen) >= hours_needed else f"⚠️ Nur {len(chosen)}/{hours_needed} Stunden"
     return {**base, "status": status, "slots": slots,
-            "total_cost_eur": round(total_cost, 2), "avg_price_ct": round(avg_price, 1),
-            "threshold_ct": round(max(p for _, p in chosen) * 100, 1)}
+            "total_cost_eur": total_cost, "avg_price_ct": avg_price,
+            "threshold_ct": round(threshold_ct, 1)}
@@ -0,0 +1,40 @@
+"""Numeric core of the /slots charge-hour selection.
+
+Compiled with numba when it is installed; otherwise `pick_slots` is None and
+callers keep their pure-Python path. numba is not part of the add-on image,
+so the compiled kernel is opt-in for installs that add it themselves.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # optional dependency
+    njit = None
+
+
+def _pick_slots(prices, hours_needed, energy_kwh):
+    """Choose the `hours_needed` cheapest entries of `prices` (EUR/kWh, hour order).
+
+    Ties keep hour order. Returns (chosen indices in hour order, kWh per slot,
+    total cost EUR, average price ct, highest chosen price ct).
+    """
+    order = np.argsort(prices, kind="mergesort")[:hours_needed]
+    idx = np.sort(order)
+    n = idx.shape[0]
+    if n == 0:
+        return idx, 0.0, 0.0, 0.0, 0.0
+    kwh_per = energy_kwh / n
+    total_cost = 0.0
+    price_sum = 0.0
+    price_max = prices[idx[0]]
+    for i in idx:
+        p = prices[i]
+        total_cost += kwh_per * p
+        price_sum += p
+        if p > price_max:
+            price_max = p
+    return idx, float(kwh_per), float(total_cost), float(price_sum / n * 100), float(price_max * 100)
+
+
+pick_slots = njit(cache=True)(_pick_slots) if njit is not None else None
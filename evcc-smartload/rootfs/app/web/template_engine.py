@@ -1,21 +1,61 @@
 """Minimal template engine for EVCC-Smartload dashboard."""
 
+import re
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
+# {{ key }} / {{key}} placeholders
+_PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
 
-def render(template_name: str, context: dict = None) -> str:
-    """Load a template file and substitute {{ key }} placeholders."""
+# Parsed templates: name → (mtime, source, tokens); re-read when the file changes
+_TEMPLATE_CACHE: Dict[str, Tuple[float, str, list]] = {}
+
+
+def _tokenize(html: str) -> List[Tuple[str, Optional[str], str]]:
+    """Split a template into (static text, placeholder key, raw placeholder) tokens.
+
+    The last token carries the trailing text and key None.
+    """
+    tokens = []
+    pos = 0
+    for m in _PLACEHOLDER.finditer(html):
+        tokens.append((html[pos:m.start()], m.group(1), m.group(0)))
+        pos = m.end()
+    tokens.append((html[pos:], None, ""))
+    return tokens
+
+
+def _load(template_name: str) -> Tuple[float, str, list]:
     path = TEMPLATE_DIR / template_name
-    try:
+    mtime = path.stat().st_mtime
+    cached = _TEMPLATE_CACHE.get(template_name)
+    if cached is None or cached[0] != mtime:
         html = path.read_text(encoding="utf-8")
+        cached = (mtime, html, _tokenize(html))
+        _TEMPLATE_CACHE[template_name] = cached
+    return cached
+
+
+def render(template_name: str, context: dict = None) -> str:
+    """Load a template file and substitute {{ key }} placeholders.
+
+    Placeholders without a context entry are left as they are. The output is
+    one join over the cached tokens, so no full-size intermediate copy is made
+    per key as with repeated str.replace.
+    """
+    try:
+        _, html, tokens = _load(template_name)
     except FileNotFoundError:
         return f"<h1>Template not found: {template_name}</h1>"
 
-    if context:
-        for key, value in context.items():
-            html = html.replace("{{ " + key + " }}", str(value))
-            html = html.replace("{{" + key + "}}", str(value))
+    if not context:
+        return html
 
-    return html
+    parts = []
+    for static, key, raw in tokens:
+        parts.append(static)
+        if key is not None:
+            parts.append(str(context[key]) if key in context else raw)
+    return "".join(parts)